@@ -18,8 +18,14 @@ from app.models.user import User
 from app.models.notification_email import NotificationEmail
 from app.models.notification_config import NotificationConfig
 from app.models.notification_history import NotificationHistory
+from app.models.notification_history_alert import NotificationHistoryAlert
 from app.models.managed_alert import ManagedAlert
 from app.models.alert_note import AlertNote
+from app.models.alert_daily_rollup import AlertDailyRollup
+from app.models.ingestion_checkpoint import IngestionCheckpoint
+from app.models.notification_outbox import NotificationOutbox
+from app.models.review_import_job import ReviewImportJob
+from app.models.notification_pending import NotificationPending
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,58 @@
+"""add ingestioncheckpoint and notificationpending
+
+Posición de la ingesta incremental de alertas y alertas gestionadas
+pendientes de notificar.
+
+Revision ID: c58833ea5bf9
+Revises: e2131df0d29e
+Create Date: 2026-10-18 09:28:24.347353
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c58833ea5bf9'
+down_revision: Union[str, None] = 'e2131df0d29e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ingestioncheckpoint',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('last_timestamp', sa.BigInteger(), nullable=False),
+        sa.Column('last_alert_id', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_ingestioncheckpoint_id'), 'ingestioncheckpoint', ['id'], unique=False)
+    op.create_index(op.f('ix_ingestioncheckpoint_name'), 'ingestioncheckpoint', ['name'], unique=True)
+
+    op.create_table(
+        'notificationpending',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('alert_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['alert_id'], ['managedalert.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_notificationpending_id'), 'notificationpending', ['id'], unique=False)
+    op.create_index(op.f('ix_notificationpending_alert_id'), 'notificationpending', ['alert_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_notificationpending_alert_id'), table_name='notificationpending')
+    op.drop_index(op.f('ix_notificationpending_id'), table_name='notificationpending')
+    op.drop_table('notificationpending')
+
+    op.drop_index(op.f('ix_ingestioncheckpoint_name'), table_name='ingestioncheckpoint')
+    op.drop_index(op.f('ix_ingestioncheckpoint_id'), table_name='ingestioncheckpoint')
+    op.drop_table('ingestioncheckpoint')
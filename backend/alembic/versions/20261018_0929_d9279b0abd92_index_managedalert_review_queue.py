@@ -0,0 +1,51 @@
+"""index managedalert review queue
+
+Índices de la cola de revisión (filtros y paginación por (created_at, id)).
+Se crean con CREATE INDEX CONCURRENTLY para no bloquear las escrituras en
+managedalert, fuera de la transacción de la migración.
+Si la creación se interrumpe, el índice queda inválido (IF NOT EXISTS no lo
+reconstruye): eliminarlo antes de volver a ejecutar la migración.
+
+Revision ID: d9279b0abd92
+Revises: 035e40224683
+Create Date: 2026-10-18 09:29:48.334162
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9279b0abd92'
+down_revision: Union[str, None] = '035e40224683'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ("ix_managedalert_state_created_at_id", ["state", "created_at", "id"]),
+    ("ix_managedalert_created_at_id", ["created_at", "id"]),
+    ("ix_managedalert_agent_id_created_at", ["agent_id", "created_at"]),
+    ("ix_managedalert_rule_level_created_at", ["rule_level", "created_at"]),
+    ("ix_managedalert_timestamp", ["timestamp"]),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(
+                name, 'managedalert', columns,
+                postgresql_concurrently=True, if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name='managedalert',
+                postgresql_concurrently=True, if_exists=True
+            )
@@ -0,0 +1,67 @@
+"""full text search on alerts and notes
+
+Columnas tsvector generadas en managedalert (descripción, 'english') y
+alertnote (contenido, 'spanish') con sus índices GIN, índice de trigramas
+sobre agent_name (extensión pg_trgm) e índice de las notas por alerta.
+Agregar una columna generada reescribe la tabla con un bloqueo exclusivo; los
+índices se crean después con CREATE INDEX CONCURRENTLY. Requiere PostgreSQL 12+.
+
+Revision ID: 11b32730be71
+Revises: dac0185afe22
+Create Date: 2026-10-18 09:30:39.636278
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '11b32730be71'
+down_revision: Union[str, None] = 'dac0185afe22'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ("ix_managedalert_search_vector", "managedalert", ["search_vector"], dict(postgresql_using="gin")),
+    (
+        "ix_managedalert_agent_name_trgm", "managedalert", ["agent_name"],
+        dict(postgresql_using="gin", postgresql_ops={"agent_name": "gin_trgm_ops"})
+    ),
+    ("ix_alertnote_search_vector", "alertnote", ["search_vector"], dict(postgresql_using="gin")),
+    ("ix_alertnote_alert_id_created_at", "alertnote", ["alert_id", "created_at"], {}),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column('managedalert', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('english', coalesce(rule_description, ''))", persisted=True)
+    ))
+    op.add_column('alertnote', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('spanish', coalesce(content, ''))", persisted=True)
+    ))
+    with op.get_context().autocommit_block():
+        for name, table, columns, options in INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=True, if_not_exists=True, **options
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table,
+                postgresql_concurrently=True, if_exists=True
+            )
+    op.drop_column('alertnote', 'search_vector')
+    op.drop_column('managedalert', 'search_vector')
@@ -0,0 +1,56 @@
+"""managedalert alert_data jsonb
+
+alert_data pasa de json a jsonb (el operador @> de los filtros por payload
+solo existe para jsonb) y se indexa con GIN jsonb_path_ops. El cambio de tipo
+reescribe la tabla con un bloqueo exclusivo; el índice se crea después con
+CREATE INDEX CONCURRENTLY, fuera de la transacción.
+
+Revision ID: dac0185afe22
+Revises: d9279b0abd92
+Create Date: 2026-10-18 09:30:21.482301
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'dac0185afe22'
+down_revision: Union[str, None] = 'd9279b0abd92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        'managedalert', 'alert_data',
+        type_=postgresql.JSONB(),
+        existing_type=postgresql.JSON(),
+        existing_nullable=True,
+        postgresql_using='alert_data::jsonb'
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_managedalert_alert_data', 'managedalert', ['alert_data'],
+            postgresql_using='gin',
+            postgresql_ops={'alert_data': 'jsonb_path_ops'},
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_managedalert_alert_data', table_name='managedalert',
+            postgresql_concurrently=True, if_exists=True
+        )
+    op.alter_column(
+        'managedalert', 'alert_data',
+        type_=postgresql.JSON(),
+        existing_type=postgresql.JSONB(),
+        existing_nullable=True,
+        postgresql_using='alert_data::json'
+    )
@@ -0,0 +1,55 @@
+"""notification digest
+
+Modo resumen de notificaciones: columnas de configuración (con valores por
+defecto en el servidor para la fila de configuración existente) y tabla que
+vincula cada notificación con todas las alertas incluidas.
+
+Revision ID: b24da343ea44
+Revises: c58833ea5bf9
+Create Date: 2026-10-18 09:37:53.688164
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b24da343ea44'
+down_revision: Union[str, None] = 'c58833ea5bf9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('notificationconfig', sa.Column('digest_enabled', sa.Boolean(), server_default=sa.false(), nullable=False))
+    op.add_column('notificationconfig', sa.Column('digest_window_seconds', sa.Integer(), server_default='60', nullable=False))
+    op.add_column('notificationconfig', sa.Column('digest_max_alerts', sa.Integer(), server_default='50', nullable=False))
+
+    op.create_table(
+        'notificationhistoryalert',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('history_id', sa.Integer(), nullable=False),
+        sa.Column('alert_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['alert_id'], ['managedalert.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['history_id'], ['notificationhistory.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('history_id', 'alert_id', name='uq_notificationhistoryalert_history_alert')
+    )
+    op.create_index(op.f('ix_notificationhistoryalert_id'), 'notificationhistoryalert', ['id'], unique=False)
+    op.create_index(op.f('ix_notificationhistoryalert_history_id'), 'notificationhistoryalert', ['history_id'], unique=False)
+    op.create_index(op.f('ix_notificationhistoryalert_alert_id'), 'notificationhistoryalert', ['alert_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_notificationhistoryalert_alert_id'), table_name='notificationhistoryalert')
+    op.drop_index(op.f('ix_notificationhistoryalert_history_id'), table_name='notificationhistoryalert')
+    op.drop_index(op.f('ix_notificationhistoryalert_id'), table_name='notificationhistoryalert')
+    op.drop_table('notificationhistoryalert')
+
+    op.drop_column('notificationconfig', 'digest_max_alerts')
+    op.drop_column('notificationconfig', 'digest_window_seconds')
+    op.drop_column('notificationconfig', 'digest_enabled')
@@ -0,0 +1,44 @@
+"""add alertdailyrollup
+
+Conteos diarios de alertas de días cerrados. Es la primera revisión: parte
+del esquema existente (usuarios, alertas gestionadas, notas y notificaciones).
+
+Revision ID: e2131df0d29e
+Revises: 
+Create Date: 2026-10-18 09:37:16.022431
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2131df0d29e'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'alertdailyrollup',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('dimension', sa.String(length=16), nullable=False),
+        sa.Column('key', sa.String(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('day', 'dimension', 'key', name='uq_alertdailyrollup_day_dimension_key')
+    )
+    op.create_index(op.f('ix_alertdailyrollup_id'), 'alertdailyrollup', ['id'], unique=False)
+    op.create_index(op.f('ix_alertdailyrollup_day'), 'alertdailyrollup', ['day'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_alertdailyrollup_day'), table_name='alertdailyrollup')
+    op.drop_index(op.f('ix_alertdailyrollup_id'), table_name='alertdailyrollup')
+    op.drop_table('alertdailyrollup')
@@ -0,0 +1,48 @@
+"""add notificationoutbox
+
+Cola de correos pendientes de envío que vacían los workers de notificaciones.
+
+Revision ID: 035e40224683
+Revises: b24da343ea44
+Create Date: 2026-10-18 09:38:21.888431
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '035e40224683'
+down_revision: Union[str, None] = 'b24da343ea44'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'notificationoutbox',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('history_id', sa.Integer(), nullable=False),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['history_id'], ['notificationhistory.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_notificationoutbox_id'), 'notificationoutbox', ['id'], unique=False)
+    op.create_index(op.f('ix_notificationoutbox_history_id'), 'notificationoutbox', ['history_id'], unique=False)
+    op.create_index('ix_notificationoutbox_status_next_attempt_at', 'notificationoutbox', ['status', 'next_attempt_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notificationoutbox_status_next_attempt_at', table_name='notificationoutbox')
+    op.drop_index(op.f('ix_notificationoutbox_history_id'), table_name='notificationoutbox')
+    op.drop_index(op.f('ix_notificationoutbox_id'), table_name='notificationoutbox')
+    op.drop_table('notificationoutbox')
@@ -0,0 +1,47 @@
+"""add reviewimportjob
+
+Importaciones en segundo plano de alertas de OpenSearch a la cola de revisión.
+
+Revision ID: 45cc3d75ff2f
+Revises: 11b32730be71
+Create Date: 2026-10-18 09:38:31.625171
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '45cc3d75ff2f'
+down_revision: Union[str, None] = '11b32730be71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'reviewimportjob',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('filters', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=True),
+        sa.Column('processed', sa.Integer(), nullable=False),
+        sa.Column('created', sa.Integer(), nullable=False),
+        sa.Column('skipped', sa.Integer(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_reviewimportjob_id'), 'reviewimportjob', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_reviewimportjob_id'), table_name='reviewimportjob')
+    op.drop_table('reviewimportjob')
@@ -1,13 +1,19 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
-from typing import Optional, List
-from app.schemas.alert import AlertResponse, AlertFilters
+from fastapi.responses import StreamingResponse
+from typing import Optional, List, Union
+from app.schemas.alert import AlertResponse, AlertSummaryResponse, AlertFilters
 from app.services.alert_service import alert_service
+from app.services.alert_export import alert_export_service
+from app.core.config import settings
+from app.core.responses import ORJSONResponse
 from app.dependencies.auth import get_current_user
+from app.middleware.role_checker import check_roles
+from app.models.user import User, UserRole
 from datetime import datetime
 
 router = APIRouter()
 
-@router.get("/", response_model=AlertResponse)
+@router.get("/", response_model=Union[AlertResponse, AlertSummaryResponse])
 async def get_alerts(
     page: int = Query(1, ge=1, description="Número de página"),
     size: int = Query(10, ge=1, le=100, description="Tamaño de página"),
@@ -18,10 +24,15 @@ async def get_alerts(
     to_date: Optional[datetime] = Query(None, description="Fecha final (ISO format)"),
     search_term: Optional[str] = Query(None, description="Término de búsqueda general"),
     alert_id: Optional[str] = Query(None, description="ID específico de una alerta"),
+    cursor: Optional[str] = Query(None, description="Paginación por cursor: '*' para iniciar, luego el next_cursor recibido"),
+    view: str = Query("full", pattern="^(full|summary)$", description="full: alerta completa; summary: solo los campos del listado"),
+    fields: Optional[List[str]] = Query(None, description="Campos adicionales para el modo resumen, p. ej. data.srcip (implica view=summary)"),
     current_user = Depends(get_current_user)
 ):
     """
     Obtiene las alertas con paginación y filtros opcionales.
+    Para recorrer páginas profundas usar `cursor` en lugar de `page`.
+    Para los listados usar `view=summary`, que no descarga full_log, decoder ni data.
     """
     try:
         filters = AlertFilters(
@@ -33,10 +44,52 @@ async def get_alerts(
             search_term=search_term,
             alert_id=alert_id
         )
-        return await alert_service.get_alerts(page=page, size=size, filters=filters)
+        result = await alert_service.get_alerts(
+            page=page,
+            size=size,
+            filters=filters,
+            cursor=cursor,
+            view=view,
+            fields=fields
+        )
+        # El servicio ya retorna modelos validados: se serializan sin revalidar
+        return ORJSONResponse(result)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/export")
+async def export_alerts(
+    format: str = Query("ndjson", pattern="^(ndjson|csv|parquet)$", description="Formato: ndjson, csv o parquet"),
+    agent_ids: Optional[List[str]] = Query(None, description="IDs de agentes"),
+    rule_levels: Optional[List[int]] = Query(None, description="Niveles de reglas"),
+    rule_groups: Optional[List[str]] = Query(None, description="Grupos de reglas"),
+    from_date: Optional[datetime] = Query(None, description="Fecha inicial (ISO format)"),
+    to_date: Optional[datetime] = Query(None, description="Fecha final (ISO format)"),
+    search_term: Optional[str] = Query(None, description="Término de búsqueda general"),
+    current_user = Depends(get_current_user)
+):
+    """
+    Exporta todas las alertas que coinciden con los filtros, en orden cronológico.
+    La respuesta se envía a medida que se leen las alertas, sin límite de páginas.
+    """
+    filters = AlertFilters(
+        agent_ids=agent_ids,
+        rule_levels=rule_levels,
+        rule_groups=rule_groups,
+        from_date=from_date,
+        to_date=to_date,
+        search_term=search_term
+    )
+    media_type, extension = alert_export_service.FORMATS[format]
+    filename = f"alertas-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.{extension}"
+    return StreamingResponse(
+        alert_export_service.export(filters, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 @router.get("/stats/weekly")
 async def get_weekly_stats(
     current_user = Depends(get_current_user)
@@ -45,7 +98,7 @@ async def get_weekly_stats(
     Obtiene estadísticas de las alertas de la última semana.
     """
     try:
-        return await alert_service.get_weekly_alert_stats()
+        return ORJSONResponse(await alert_service.get_weekly_alert_stats())
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -58,8 +111,31 @@ async def get_monthly_stats(
     """
     try:
         stats = await alert_service.get_monthly_alert_stats()
-        if "error" in stats:
-            return stats  # Devuelve el mensaje de error si no hay alertas
-        return stats
+        # Sin alertas, stats trae el mensaje de error en lugar de los conteos
+        return ORJSONResponse(stats)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/stats")
+async def get_stats(
+    days: int = Query(90, ge=1, le=settings.ROLLUP_RETENTION_DAYS, description="Cantidad de días hacia atrás"),
+    current_user = Depends(get_current_user)
+):
+    """
+    Obtiene estadísticas de las alertas de los últimos `days` días.
+    Los días cerrados se leen de los rollups diarios guardados en Postgres.
+    """
+    try:
+        return ORJSONResponse(await alert_service.get_alert_stats(days))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/stats/cache")
+@check_roles([UserRole.ADMIN])
+async def get_stats_cache_info(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Obtiene los contadores de la caché de estadísticas (solo admin).
+    """
+    return alert_service.get_stats_cache_info()
@@ -5,7 +5,8 @@ from fastapi.security import OAuth2PasswordRequestForm
 
 from ..core.security import (
     create_access_token,
-    verify_password,
+    verify_password_async,
+    get_password_hash_async,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
 from ..schemas.auth import Token, UserCreate, User
@@ -24,13 +25,22 @@ async def login_for_access_token(
         (UserModel.username == form_data.username)
     ).first()
     
-    if not user or not verify_password(form_data.password, str(user.hashed_password)):
+    is_valid, new_hash = (False, None)
+    if user:
+        is_valid, new_hash = await verify_password_async(form_data.password, str(user.hashed_password))
+    
+    if not user or not is_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Correo, nombre de usuario o contraseña incorrectos",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Actualizar el hash si se cambió el costo de bcrypt
+    if new_hash:
+        setattr(user, 'hashed_password', new_hash)
+        db.commit()
+    
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": str(user.email)}, expires_delta=access_token_expires
@@ -51,14 +61,12 @@ async def register_user(user: UserCreate, db: Session = Depends(get_db)):
             detail="El nombre de usuario ya está registrado"
         )
     
-    from ..core.security import get_password_hash
-    
     # Crear una nueva instancia del modelo
     db_user = UserModel()
     # Establecer los valores manualmente
     setattr(db_user, 'email', str(user.email))
     setattr(db_user, 'username', str(user.username))
-    setattr(db_user, 'hashed_password', get_password_hash(str(user.password)))
+    setattr(db_user, 'hashed_password', await get_password_hash_async(str(user.password)))
     setattr(db_user, 'role', UserRole.OPERATOR)
     
     db.add(db_user)
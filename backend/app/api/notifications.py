@@ -1,5 +1,5 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.db.base import get_db
@@ -8,7 +8,9 @@ from app.models.user import User, UserRole
 from app.models.notification_email import NotificationEmail
 from app.models.managed_alert import ManagedAlert
 from app.models.notification_config import NotificationConfig
+from app.models.notification_outbox import NotificationOutbox, OutboxStatus
 from app.services.email_service import EmailService
+from app.services.notification_outbox import notification_outbox
 from app.middleware.role_checker import check_roles
 from app.schemas.notification import (
     NotificationEmailCreate,
@@ -17,7 +19,9 @@ from app.schemas.notification import (
     NotificationConfigUpdate,
     NotificationConfigResponse,
     NotificationConfigCreate,
-    NotificationSendRequest
+    NotificationSendRequest,
+    NotificationSendResponse,
+    NotificationJobResponse
 )
 
 router = APIRouter()
@@ -63,6 +67,7 @@ def create_notification_config(
     try:
         db.commit()
         db.refresh(new_config)
+        EmailService.invalidate_context()
     except Exception as e:
         db.rollback()
         raise HTTPException(
@@ -91,6 +96,7 @@ def update_notification_config(
     
     db.commit()
     db.refresh(current_config)
+    EmailService.invalidate_context()
     return current_config
 
 @router.get("/notification/emails", response_model=List[NotificationEmailResponse])
@@ -115,6 +121,7 @@ def create_notification_email(
     try:
         db.commit()
         db.refresh(db_email)
+        EmailService.invalidate_context()
     except Exception:
         db.rollback()
         raise HTTPException(status_code=400, detail="El correo ya existe")
@@ -137,6 +144,7 @@ def update_notification_email(
         setattr(db_email, key, value)
     db.commit()
     db.refresh(db_email)
+    EmailService.invalidate_context()
     return db_email
 
 @router.delete("/notification/emails/{email_id}")
@@ -153,17 +161,47 @@ def delete_notification_email(
     
     db.delete(db_email)
     db.commit()
+    EmailService.invalidate_context()
     return {"message": "Correo eliminado"}
 
+@router.get("/notification/jobs", response_model=List[NotificationJobResponse])
+@check_roles([UserRole.ADMIN])
+def get_notification_jobs(
+    status: Optional[OutboxStatus] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Lista los envíos de la cola de notificaciones, opcionalmente filtrados por estado"""
+    query = db.query(NotificationOutbox)
+    if status:
+        query = query.filter(NotificationOutbox.status == status)
+    return query.order_by(NotificationOutbox.id.desc()).limit(limit).all()
+
+@router.post("/notification/jobs/{job_id}/retry", response_model=NotificationJobResponse)
+@check_roles([UserRole.ADMIN])
+def retry_notification_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Vuelve a encolar un envío descartado"""
+    job = db.query(NotificationOutbox).filter(NotificationOutbox.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Envío no encontrado")
+    if job.status != OutboxStatus.DEAD:
+        raise HTTPException(status_code=400, detail="Solo se pueden reintentar envíos descartados")
+    return notification_outbox.retry(db, job)
+
 # Endpoint para operadores
 
-@router.post("/notification/send")
+@router.post("/notification/send", response_model=NotificationSendResponse, status_code=202)
 def send_notification(
     request: NotificationSendRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Envía una notificación manual para una alerta"""
+    """Encola una notificación manual para una alerta. Retorna el ID del envío."""
     # Verificar que la alerta existe
     alert = db.query(ManagedAlert).filter(ManagedAlert.id == request.alert_id).first()
     if not alert:
@@ -180,8 +218,8 @@ def send_notification(
     if not emails:
         raise HTTPException(status_code=400, detail="No se encontraron correos válidos")
     
-    # Enviar la notificación
-    success, error_message = EmailService.send_alert_notification(
+    # Encolar la notificación
+    job, error_message = EmailService.enqueue_alert_notification(
         db=db,
         alert=alert,
         user=current_user,
@@ -189,10 +227,23 @@ def send_notification(
         custom_message=request.message
     )
     
-    if not success:
+    if job is None:
         raise HTTPException(
-            status_code=500,
-            detail=error_message or "Error al enviar la notificación"
+            status_code=400,
+            detail=error_message or "Error al encolar la notificación"
         )
+    notification_outbox.wake()
     
-    return {"message": "Notificación enviada correctamente"} 
\ No newline at end of file
+    return {"message": "Notificación encolada para su envío", "job_id": job.id}
+
+@router.get("/notification/jobs/{job_id}", response_model=NotificationJobResponse)
+def get_notification_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Obtiene el estado de un envío de la cola de notificaciones"""
+    job = db.query(NotificationOutbox).filter(NotificationOutbox.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Envío no encontrado")
+    return job 
\ No newline at end of file
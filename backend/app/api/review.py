@@ -1,18 +1,32 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import Optional
-from sqlalchemy.orm import Session
-from app.db.base import get_db
+from typing import Optional, List
+from datetime import datetime
+import json
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.responses import ORJSONResponse
+from app.db.base import get_async_db
 from app.dependencies.auth import get_current_user
 from app.schemas.managed_alert import (
     ManagedAlertCreate,
     ManagedAlertUpdate,
     ManagedAlertResponse,
-    ManagedAlertInDB
+    ManagedAlertInDB,
+    ManagedAlertFilters,
+    ManagedAlertSearchResponse,
+    ManagedAlertBulkCreate,
+    ManagedAlertBulkCreateResponse,
+    ManagedAlertBulkIds,
+    ManagedAlertBulkResult,
+    ManagedAlertImportJobResponse
 )
+from app.schemas.alert import AlertFilters
 from app.schemas.alert_note import AlertNoteCreate, AlertNoteUpdate, AlertNoteInDB
 from app.models.user import User
 from app.models.managed_alert import AlertState
+from app.models.review_import_job import ReviewImportJob
 from app.services.review_service import review_service
+from app.services.review_import import review_import_service
 
 router = APIRouter()
 
@@ -20,7 +34,7 @@ router = APIRouter()
 async def create_managed_alert(
     *,
     alert: ManagedAlertCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -35,17 +49,150 @@ async def create_managed_alert(
         )
     return result
 
+def check_bulk_size(count: int):
+    """Verifica que la operación en lote no supere el máximo configurado"""
+    if count > settings.REVIEW_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Se admiten como máximo {settings.REVIEW_BULK_MAX_ITEMS} alertas por solicitud"
+        )
+
+def bulk_result(requested: List[int], affected: List[int]) -> ManagedAlertBulkResult:
+    """Arma la respuesta de una operación en lote indicando los IDs inexistentes"""
+    found = set(affected)
+    not_found = list(dict.fromkeys(id_ for id_ in requested if id_ not in found))
+    return ManagedAlertBulkResult(ids=affected, not_found=not_found)
+
+@router.post("/bulk", response_model=ManagedAlertBulkCreateResponse)
+async def create_managed_alerts_bulk(
+    *,
+    payload: ManagedAlertBulkCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Crea varias alertas gestionadas en una sola transacción.
+    Las alertas que ya estaban gestionadas se omiten.
+    """
+    check_bulk_size(len(payload.alerts))
+    created = await review_service.create_managed_alerts_bulk(
+        db=db,
+        alerts=payload.alerts,
+        use_seen_cache=False
+    )
+    return ManagedAlertBulkCreateResponse(
+        created=created,  # type: ignore
+        skipped=len(payload.alerts) - len(created)
+    )
+
+@router.post("/bulk/close", response_model=ManagedAlertBulkResult)
+async def close_managed_alerts_bulk(
+    *,
+    payload: ManagedAlertBulkIds,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Cierra varias alertas gestionadas con una sola actualización.
+    """
+    check_bulk_size(len(payload.ids))
+    updated = await review_service.update_managed_alerts_state_bulk(
+        db=db,
+        ids=payload.ids,
+        state=AlertState.CLOSED.value
+    )
+    return bulk_result(payload.ids, updated)
+
+@router.post("/bulk/reopen", response_model=ManagedAlertBulkResult)
+async def reopen_managed_alerts_bulk(
+    *,
+    payload: ManagedAlertBulkIds,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Reabre varias alertas gestionadas con una sola actualización.
+    """
+    check_bulk_size(len(payload.ids))
+    updated = await review_service.update_managed_alerts_state_bulk(
+        db=db,
+        ids=payload.ids,
+        state=AlertState.OPEN.value
+    )
+    return bulk_result(payload.ids, updated)
+
+@router.post("/bulk/delete", response_model=ManagedAlertBulkResult)
+async def delete_managed_alerts_bulk(
+    *,
+    payload: ManagedAlertBulkIds,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Elimina varias alertas gestionadas y todas sus notas asociadas.
+    Si alguna tiene notificaciones registradas no se elimina ninguna (409).
+    """
+    check_bulk_size(len(payload.ids))
+    deleted, notified = await review_service.delete_managed_alerts_bulk(db=db, ids=payload.ids)
+    if notified:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "message": "Las alertas con notificaciones registradas no se pueden eliminar",
+                "ids": notified
+            }
+        )
+    return bulk_result(payload.ids, deleted)
+
+@router.post("/import", response_model=ManagedAlertImportJobResponse, status_code=202)
+async def import_alerts_by_filter(
+    *,
+    filters: AlertFilters,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Agrega a la cola de revisión todas las alertas de OpenSearch que coinciden con
+    los filtros. La importación corre en segundo plano: retorna el job para
+    consultar su progreso en GET /review/import/{job_id}.
+    """
+    return await review_import_service.start_import(db=db, filters=filters, user=current_user)
+
+@router.get("/import/{job_id}", response_model=ManagedAlertImportJobResponse)
+async def get_import_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Obtiene el progreso de una importación de alertas por filtro.
+    """
+    job = await db.get(ReviewImportJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Importación no encontrada")
+    return job
+
 @router.get("", response_model=ManagedAlertResponse)
 async def get_managed_alerts(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
     page: int = Query(1, ge=1, description="Número de página"),
     size: int = Query(10, ge=1, le=100, description="Tamaño de página"),
-    state: Optional[str] = Query(None, description="Filtrar por estado (abierta/cerrada)")
+    state: Optional[str] = Query(None, description="Filtrar por estado (abierta/cerrada)"),
+    rule_levels: Optional[List[int]] = Query(None, description="Niveles de reglas"),
+    agent_ids: Optional[List[str]] = Query(None, description="IDs de agentes"),
+    from_date: Optional[datetime] = Query(None, description="Fecha inicial de la alerta (ISO format)"),
+    to_date: Optional[datetime] = Query(None, description="Fecha final de la alerta (ISO format)"),
+    contains: Optional[str] = Query(None, description='Documento JSON contenido en los datos de la alerta, p. ej. {"data": {"srcip": "10.0.0.1"}}'),
+    match: Optional[List[str]] = Query(None, description="Filtros ruta:valor sobre los datos de la alerta, p. ej. data.srcip:10.0.0.1 o rule.groups:sshd"),
+    cursor: Optional[str] = Query(None, description="Paginación por cursor: el next_cursor recibido"),
+    total_mode: str = Query("cached", pattern="^(exact|cached|estimate)$", description="Cálculo del total: exact, cached o estimate")
 ):
     """
     Obtiene la lista de alertas gestionadas con paginación.
-    Opcionalmente se puede filtrar por estado.
+    Opcionalmente se puede filtrar por estado, nivel, agente, rango de fechas y
+    por el contenido de los datos de la alerta (`contains`, `match`).
+    Para recorrer la cola usar `cursor` en lugar de `page`.
     """
     if state and state not in [AlertState.OPEN.value, AlertState.CLOSED.value]:
         raise HTTPException(
@@ -53,17 +200,84 @@ async def get_managed_alerts(
             detail="Estado no válido. Debe ser 'abierta' o 'cerrada'"
         )
     
-    return await review_service.get_managed_alerts(
-        db=db,
-        page=page,
-        size=size,
-        state=state
+    data_contains = None
+    if contains:
+        try:
+            data_contains = json.loads(contains)
+        except ValueError:
+            data_contains = None
+        if not isinstance(data_contains, dict):
+            raise HTTPException(status_code=400, detail="El filtro 'contains' debe ser un objeto JSON")
+    
+    data_match = []
+    for item in match or []:
+        path, separator, value = item.partition(":")
+        if not separator or not path or not all(path.split(".")):
+            raise HTTPException(status_code=400, detail=f"Filtro 'match' inválido: {item}. Formato esperado ruta:valor")
+        data_match.append((path, value))
+    
+    filters = ManagedAlertFilters(
+        state=state,
+        rule_levels=rule_levels,
+        agent_ids=agent_ids,
+        from_date=from_date,
+        to_date=to_date,
+        data_contains=data_contains,
+        data_match=data_match or None
     )
+    try:
+        result = await review_service.get_managed_alerts(
+            db=db,
+            page=page,
+            size=size,
+            filters=filters,
+            cursor=cursor,
+            total_mode=total_mode
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # El servicio ya retorna modelos validados: se serializan sin revalidar
+    return ORJSONResponse(result)
+
+@router.get("/search", response_model=ManagedAlertSearchResponse)
+async def search_managed_alerts(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+    q: Optional[str] = Query(None, min_length=1, description='Texto a buscar en descripciones y notas (admite "frases", OR y -exclusiones)'),
+    agent: Optional[str] = Query(None, min_length=1, description="Parte del nombre del agente"),
+    state: Optional[str] = Query(None, description="Filtrar por estado (abierta/cerrada)"),
+    size: int = Query(10, ge=1, le=100, description="Tamaño de página"),
+    cursor: Optional[str] = Query(None, description="Paginación por cursor: el next_cursor recibido")
+):
+    """
+    Busca alertas gestionadas por texto en la descripción de la regla y en sus notas,
+    y/o por parte del nombre del agente. Los resultados se ordenan por relevancia.
+    """
+    if not q and not agent:
+        raise HTTPException(status_code=400, detail="Debe indicar 'q' o 'agent'")
+    if state and state not in [AlertState.OPEN.value, AlertState.CLOSED.value]:
+        raise HTTPException(
+            status_code=400,
+            detail="Estado no válido. Debe ser 'abierta' o 'cerrada'"
+        )
+    try:
+        result = await review_service.search_managed_alerts(
+            db=db,
+            text=q,
+            agent=agent,
+            state=state,
+            size=size,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # El servicio ya retorna modelos validados: se serializan sin revalidar
+    return ORJSONResponse(result)
 
 @router.get("/{alert_id}", response_model=ManagedAlertInDB)
 async def get_managed_alert(
     alert_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -79,7 +293,7 @@ async def update_managed_alert(
     *,
     alert_id: int,
     alert_update: ManagedAlertUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -105,7 +319,7 @@ async def create_alert_note(
     *,
     alert_id: int,
     note: AlertNoteCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -124,7 +338,7 @@ async def create_alert_note(
 @router.get("/{alert_id}/notes", response_model=list[AlertNoteInDB])
 async def get_alert_notes(
     alert_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -143,7 +357,7 @@ async def update_alert_note(
     alert_id: int,
     note_id: int,
     note: AlertNoteUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -167,7 +381,7 @@ async def update_alert_note(
 @router.delete("/{alert_id}")
 async def delete_managed_alert(
     alert_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -182,7 +396,7 @@ async def delete_managed_alert(
 async def delete_alert_note(
     alert_id: int,
     note_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
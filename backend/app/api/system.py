@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends
+from app.core.config import settings
+from app.db.base import engine, async_engine, sync_pool_metrics, async_pool_metrics
+from app.dependencies.auth import get_current_user
+from app.middleware.role_checker import check_roles
+from app.models.user import User, UserRole
+from app.services.alert_service import alert_service
+
+router = APIRouter()
+
+@router.get("/db-pool")
+@check_roles([UserRole.ADMIN])
+async def get_db_pool_stats(
+    reset: bool = False,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Obtiene el estado y las métricas de los pools de conexiones de este worker
+    (solo admin). Con `reset` se reinician los contadores después de leerlos.
+    """
+    pools = [
+        sync_pool_metrics.snapshot(engine.pool),
+        async_pool_metrics.snapshot(async_engine.pool)
+    ]
+    if reset:
+        sync_pool_metrics.reset()
+        async_pool_metrics.reset()
+    return {
+        "config": {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            "pool_pre_ping": settings.DB_POOL_PRE_PING,
+            # Conexiones máximas de este worker; multiplicar por la cantidad de workers de uvicorn
+            "max_connections_per_worker": 2 * (settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW)
+        },
+        "pools": pools
+    }
+
+@router.get("/alert-parsing")
+@check_roles([UserRole.ADMIN])
+async def get_alert_parsing_stats(
+    reset: bool = False,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Obtiene la cantidad de alertas de OpenSearch convertidas y descartadas por
+    este worker (solo admin): `incomplete` sin agente, regla o timestamp e
+    `invalid` con datos que no pasan la validación.
+    Con `reset` se reinician los contadores después de leerlos.
+    """
+    return alert_service.get_parse_stats(reset=reset)
@@ -3,8 +3,9 @@ from sqlalchemy.orm import Session
 from app.db.base import get_db
 from app.models.user import User, UserRole
 from app.schemas.user import UserResponse, UserUpdate, UserRoleUpdate, UserList
-from app.dependencies.auth import get_current_user
+from app.dependencies.auth import get_current_user, invalidate_user_cache
 from app.middleware.role_checker import check_roles
+from app.services.email_service import EmailService
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -34,10 +35,12 @@ async def update_own_profile(
         update_data.pop("role")
     if "is_superuser" in update_data:
         update_data.pop("is_superuser")
+    previous_email = str(db_user.email)
     for field, value in update_data.items():
         setattr(db_user, field, value)
     db.commit()
     db.refresh(db_user)
+    invalidate_user_cache(previous_email)
     return db_user
 
 @router.get("", response_model=UserList)
@@ -88,11 +91,13 @@ async def update_user(
         raise HTTPException(status_code=404, detail="Usuario no encontrado")
     
     # Actualizar campos si están presentes en la solicitud
+    previous_email = str(db_user.email)
     for field, value in user_update.dict(exclude_unset=True).items():
         setattr(db_user, field, value)
     
     db.commit()
     db.refresh(db_user)
+    invalidate_user_cache(previous_email)
     return db_user
 
 @router.put("/{user_id}/role", response_model=UserResponse)
@@ -124,6 +129,7 @@ async def update_user_role(
     setattr(db_user, 'role', role_update.role)
     db.commit()
     db.refresh(db_user)
+    invalidate_user_cache(str(db_user.email))
     return db_user
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -152,4 +158,7 @@ async def delete_user(
     
     db.delete(db_user)
     db.commit()
+    invalidate_user_cache(str(db_user.email))
+    # El usuario eliminado puede ser el remitente de las notificaciones automáticas
+    EmailService.invalidate_context()
     return None 
\ No newline at end of file
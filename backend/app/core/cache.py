@@ -0,0 +1,72 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, Optional
+import time
+
+
+class TTLCache:
+    """
+    Caché en memoria con expiración por TTL y tamaño acotado (se descarta la
+    entrada usada menos recientemente). Lleva contadores de aciertos y fallos.
+    Es segura para usarse desde endpoints síncronos (threadpool) y asíncronos.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 128):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = Lock()
+
+    def _lookup(self, key: Hashable) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Retorna el valor cacheado o None, contabilizando el acierto o fallo"""
+        with self._lock:
+            value = self._lookup(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Igual que get pero sin afectar los contadores"""
+        with self._lock:
+            return self._lookup(key)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Guarda un valor con el TTL configurado"""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Elimina una entrada, o todas si no se indica la clave"""
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores de uso de la caché"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+                "ttl": self.ttl
+            }
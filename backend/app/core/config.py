@@ -31,11 +31,19 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str
     SQLALCHEMY_DATABASE_URI: Optional[str] = None
+    SQLALCHEMY_ASYNC_DATABASE_URI: Optional[str] = None  # Por defecto, la misma base con el driver asyncpg
+    DB_POOL_SIZE: int = 5  # Conexiones persistentes por motor (sync y async) y por worker de uvicorn
+    DB_MAX_OVERFLOW: int = 10  # Conexiones adicionales temporales cuando el pool está agotado
+    DB_POOL_TIMEOUT: int = 30  # Segundos de espera por una conexión libre antes de fallar
+    DB_POOL_RECYCLE: int = 1800  # Segundos tras los cuales se reemplaza una conexión (-1 para no reciclar)
+    DB_POOL_PRE_PING: bool = True  # Verificar la conexión en cada checkout (un round trip extra); si es False se confía en el reciclado
 
     # Variables de Seguridad
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    BCRYPT_ROUNDS: int = 12  # Costo de bcrypt; los hashes con otro costo se actualizan al iniciar sesión
+    PASSWORD_HASH_WORKERS: int = 4  # Hilos dedicados a calcular y verificar hashes de contraseñas
 
     # Variables de Admin Inicial
     INITIAL_ADMIN_EMAIL: str
@@ -51,6 +59,54 @@ class Settings(BaseSettings):
     OPENSEARCH_USE_SSL: bool = True
     OPENSEARCH_VERIFY_CERTS: bool = True
     OPENSEARCH_CA_CERTS: str = str(BASE_DIR / "app" / "opensearch" / "certs" / "opensearch.crt")
+    OPENSEARCH_POOL_MAXSIZE: int = 20  # Conexiones simultáneas del cliente asíncrono
+    OPENSEARCH_INDEX_CACHE_TTL: int = 300  # Segundos entre refrescos del listado de índices existentes
+    OPENSEARCH_PIT_KEEP_ALIVE: str = "5m"  # Tiempo de vida del point-in-time entre páginas con cursor
+    ALERT_EXPORT_BATCH_SIZE: int = 5000  # Alertas leídas por consulta al exportar (un row group en Parquet)
+
+    # Variables de envío de correos
+    SMTP_POOL_SIZE: int = 3  # Conexiones SMTP autenticadas que se mantienen abiertas
+    SMTP_POOL_IDLE_TIMEOUT: int = 240  # Segundos antes de descartar una conexión ociosa
+    SMTP_TIMEOUT: int = 30
+
+    # Variables de caché
+    STATS_CACHE_TTL: int = 60  # Segundos que se reutilizan las estadísticas del dashboard
+    REVIEW_SEEN_CACHE_SIZE: int = 50000  # alert_id ya gestionados que se recuerdan en memoria
+    REVIEW_SEEN_CACHE_TTL: int = 3600  # Segundos que se recuerda cada alert_id
+    REVIEW_COUNT_CACHE_TTL: int = 30  # Segundos que se reutiliza el total de la cola de revisión por filtro
+    REVIEW_COUNT_ESTIMATE_CAP: int = 10000  # Tope del conteo en modo estimado (total_mode=estimate)
+    NOTIFICATION_CONTEXT_CACHE_TTL: int = 300  # Segundos que se reutilizan la configuración y los destinatarios
+    AUTH_CACHE_SIZE: int = 10000  # Tokens y usuarios autenticados que se recuerdan en memoria
+    AUTH_TOKEN_CACHE_TTL: int = 300  # Segundos que se reutiliza un token ya decodificado
+    AUTH_PRINCIPAL_CACHE_TTL: int = 60  # Segundos que se reutilizan los datos del usuario autenticado
+
+    # Variables de rollups diarios de alertas
+    ROLLUP_RETENTION_DAYS: int = 365  # Días cerrados que se mantienen agregados en Postgres
+    ROLLUP_TERMS_SIZE: int = 500  # Reglas y agentes distintos que se guardan por día
+    ROLLUP_GRACE_MINUTES: int = 15  # Margen tras la medianoche para alertas que llegan tarde
+
+    # Variables de ingesta de alertas
+    INGESTION_BATCH_SIZE: int = 500  # Alertas leídas por consulta al avanzar desde el checkpoint
+    INGESTION_INITIAL_LOOKBACK_MINUTES: int = 60  # Ventana inicial si todavía no hay checkpoint
+    INGESTION_SAFETY_LAG_SECONDS: int = 120  # Margen para alertas indexadas con retraso: no se ingiere más allá de ahora menos este margen
+
+    # Variables de la cola de notificaciones
+    NOTIFICATION_WORKERS: int = 3  # Envíos simultáneos desde la cola
+    NOTIFICATION_POLL_INTERVAL: int = 5  # Segundos entre consultas a la cola cuando está vacía
+    NOTIFICATION_MAX_ATTEMPTS: int = 6  # Intentos antes de descartar el envío
+    NOTIFICATION_RETRY_BASE_SECONDS: int = 30  # Espera del primer reintento (se duplica en cada uno)
+    NOTIFICATION_RETRY_MAX_SECONDS: int = 3600  # Espera máxima entre reintentos
+    NOTIFICATION_SEND_LEASE_SECONDS: int = 120  # Tiempo tras el cual un envío sin terminar se retoma
+
+    # Variables de operaciones en lote de la cola de revisión
+    REVIEW_BULK_MAX_ITEMS: int = 5000  # Alertas o IDs aceptados por solicitud
+    REVIEW_IMPORT_BATCH_SIZE: int = 500  # Alertas leídas de OpenSearch e insertadas por lote al importar por filtro
+    REVIEW_IMPORT_MAX_ALERTS: int = 100000  # Máximo de alertas que puede abarcar una importación por filtro
+
+    # Variables de compresión de respuestas
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # Bytes a partir de los cuales se comprime una respuesta
+    COMPRESSION_GZIP_LEVEL: int = 6  # Nivel de gzip (1 = más rápido, 9 = más compresión)
+    COMPRESSION_BROTLI_QUALITY: int = 4  # Calidad de brotli (0-11); valores bajos para contenido dinámico
 
     class Config:
         case_sensitive = True
@@ -64,12 +120,17 @@ class Settings(BaseSettings):
         self.BACKEND_CORS_ORIGINS = self.BACKEND_CORS_ORIGINS_LIST
 
     def _init_database_url(self) -> None:
-        """Inicializa la URL de la base de datos si no está configurada"""
+        """Inicializa las URLs (síncrona y asíncrona) de la base de datos si no están configuradas"""
         if not self.SQLALCHEMY_DATABASE_URI:
             self.SQLALCHEMY_DATABASE_URI = (
                 f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
                 f"@{self.POSTGRES_SERVER}/{self.POSTGRES_DB}"
             )
+        if not self.SQLALCHEMY_ASYNC_DATABASE_URI:
+            scheme, _, rest = self.SQLALCHEMY_DATABASE_URI.partition("://")
+            if scheme.split("+")[0] == "postgresql":
+                scheme = "postgresql+asyncpg"
+            self.SQLALCHEMY_ASYNC_DATABASE_URI = f"{scheme}://{rest}"
 
     def _validate_config(self) -> None:
         """Valida la configuración crítica"""
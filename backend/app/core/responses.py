@@ -0,0 +1,24 @@
+from typing import Any
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+def _default(obj: Any) -> Any:
+    """Convierte los tipos que orjson no serializa por sí mismo"""
+    if isinstance(obj, BaseModel):
+        # Igual que FastAPI: campos por alias; orjson serializa el resultado (datetime incluidos)
+        return obj.model_dump(by_alias=True)
+    return jsonable_encoder(obj)
+
+class ORJSONResponse(JSONResponse):
+    """
+    Respuesta JSON serializada con orjson. Acepta directamente modelos Pydantic,
+    datetime (los UTC con sufijo Z, como Pydantic), Enum y UUID, sin pasar por
+    jsonable_encoder. Los endpoints que ya obtienen modelos validados del servicio
+    pueden retornarla directamente para evitar la revalidación del response_model.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
@@ -1,5 +1,7 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
@@ -9,7 +11,14 @@ SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = settings.ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+
+# bcrypt libera el GIL: los hashes se calculan en hilos dedicados sin bloquear el
+# event loop, y el tamaño del pool acota la CPU que puede consumir una ráfaga de logins
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
 
@@ -21,6 +30,22 @@ def get_password_hash(password: str) -> str:
     """Genera un hash de la contraseña."""
     return pwd_context.hash(password)
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica la contraseña en el pool de hashing. Si el hash usa un costo distinto
+    al configurado, retorna también el hash actualizado para guardarlo.
+    Retorna una tupla (is_valid, new_hash).
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        password_executor, pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
+async def get_password_hash_async(password: str) -> str:
+    """Genera un hash de la contraseña en el pool de hashing."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, pwd_context.hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Crea un token JWT."""
     to_encode = data.copy()
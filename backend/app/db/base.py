@@ -1,7 +1,10 @@
-from typing import Generator
+from typing import Generator, AsyncGenerator
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from app.core.config import settings
+from app.db.pool_metrics import PoolMetrics, instrumented_pool_class
 from app.models.base_model import Base
 
 # Importar todos los modelos para que Alembic los detecte
@@ -9,14 +12,35 @@ from app.models.user import User
 from app.models.notification_email import NotificationEmail
 from app.models.notification_config import NotificationConfig
 from app.models.notification_history import NotificationHistory
+from app.models.notification_history_alert import NotificationHistoryAlert
 from app.models.managed_alert import ManagedAlert
 from app.models.alert_note import AlertNote
+from app.models.alert_daily_rollup import AlertDailyRollup
+from app.models.ingestion_checkpoint import IngestionCheckpoint
+from app.models.notification_outbox import NotificationOutbox
+from app.models.review_import_job import ReviewImportJob
+from app.models.notification_pending import NotificationPending
 
 # Crear el motor de SQLAlchemy
 if not settings.SQLALCHEMY_DATABASE_URI:
     raise ValueError("Database URL is not set")
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI), pool_pre_ping=True)
+# Parámetros del pool compartidos por ambos motores
+pool_args = dict(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING
+)
+
+sync_pool_metrics = PoolMetrics("sync")
+engine = create_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    poolclass=instrumented_pool_class(QueuePool, sync_pool_metrics),
+    **pool_args
+)
+sync_pool_metrics.attach(engine)
 
 # Crear la sesión
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -31,4 +55,30 @@ def get_db() -> Generator:
         db = SessionLocal()
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+# Motor y sesiones asíncronas (asyncpg): las consultas no bloquean el event loop
+async_pool_metrics = PoolMetrics("async")
+async_engine = create_async_engine(
+    str(settings.SQLALCHEMY_ASYNC_DATABASE_URI),
+    poolclass=instrumented_pool_class(AsyncAdaptedQueuePool, async_pool_metrics),
+    **pool_args
+)
+async_pool_metrics.attach(async_engine.sync_engine)
+
+# expire_on_commit=False: tras el commit los objetos se siguen leyendo sin volver a
+# consultar la base (en modo asíncrono no hay carga implícita de atributos)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Obtiene una sesión asíncrona de base de datos.
+    Se usa como dependencia en FastAPI.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
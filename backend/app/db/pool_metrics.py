@@ -0,0 +1,85 @@
+from typing import Any, Dict, Type
+from threading import Lock
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.pool import Pool
+
+class PoolMetrics:
+    """
+    Métricas de un pool de conexiones: espera al obtener una conexión, timeouts,
+    conexiones en uso y de overflow. Los contadores de checkout/checkin, conexiones
+    nuevas e invalidadas se alimentan con los eventos del pool de SQLAlchemy.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Reinicia los contadores"""
+        with self._lock:
+            self.checkouts = 0
+            self.checkins = 0
+            self.connects = 0
+            self.invalidations = 0
+            self.timeouts = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def _increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def attach(self, target: Any) -> None:
+        """Registra los eventos del pool (acepta un Engine o un Pool)"""
+        event.listen(target, "connect", lambda *args: self._increment("connects"))
+        event.listen(target, "checkout", lambda *args: self._increment("checkouts"))
+        event.listen(target, "checkin", lambda *args: self._increment("checkins"))
+        event.listen(target, "invalidate", lambda *args: self._increment("invalidations"))
+
+    def snapshot(self, pool: Pool) -> Dict[str, Any]:
+        """Estado actual del pool y contadores acumulados"""
+        with self._lock:
+            waits = self.checkouts + self.timeouts
+            return {
+                "name": self.name,
+                "pool_size": pool.size() if hasattr(pool, "size") else None,
+                "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
+                "checked_in": pool.checkedin() if hasattr(pool, "checkedin") else None,
+                "overflow": pool.overflow() if hasattr(pool, "overflow") else None,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "checkout_timeouts": self.timeouts,
+                "checkout_wait_avg_ms": round(self.wait_total / waits * 1000, 3) if waits else 0.0,
+                "checkout_wait_max_ms": round(self.wait_max * 1000, 3)
+            }
+
+def instrumented_pool_class(base: Type[Pool], metrics: PoolMetrics) -> Type[Pool]:
+    """
+    Subclase del pool que mide cuánto se espera por una conexión y cuántas
+    esperas terminan en timeout. No hay un evento previo al checkout, por lo
+    que se mide alrededor de `_do_get`. La clase se conserva al recrear el pool.
+    """
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return base._do_get(self)  # type: ignore[attr-defined]
+        except exc.TimeoutError:
+            metrics.record_timeout()
+            raise
+        finally:
+            metrics.record_wait(time.perf_counter() - start)
+
+    return type(f"Instrumented{base.__name__}", (base,), {"_do_get": _do_get})
@@ -1,8 +1,11 @@
+from typing import Any, Dict, Optional, Tuple
+import time
 from fastapi import Depends, HTTPException, status
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 from fastapi.security import OAuth2PasswordBearer
 
+from ..core.cache import TTLCache
 from ..core.config import settings
 from ..db.base import get_db
 from ..models.user import User
@@ -10,6 +13,34 @@ from ..schemas.auth import TokenData
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 
+# Tokens ya decodificados: token -> (email, expiración)
+_token_cache = TTLCache(ttl=settings.AUTH_TOKEN_CACHE_TTL, maxsize=settings.AUTH_CACHE_SIZE)
+# Datos de los usuarios autenticados (sin el hash de la contraseña): email -> columnas
+_principal_cache = TTLCache(ttl=settings.AUTH_PRINCIPAL_CACHE_TTL, maxsize=settings.AUTH_CACHE_SIZE)
+
+def invalidate_user_cache(email: Optional[str] = None) -> None:
+    """
+    Descarta los datos cacheados de un usuario (o de todos). Debe llamarse al
+    modificar, desactivar o eliminar usuarios.
+    """
+    _principal_cache.invalidate(email)
+
+def _decode_token(token: str) -> Optional[str]:
+    """Retorna el email (sub) de un token válido, reutilizando los tokens ya decodificados"""
+    cached: Optional[Tuple[str, float]] = _token_cache.get(token)
+    if cached is not None:
+        email, expires_at = cached
+        if expires_at > time.time():
+            return email
+        _token_cache.invalidate(token)
+
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    email = payload.get("sub")
+    if not isinstance(email, str):
+        return None
+    _token_cache.set(token, (email, float(payload.get("exp", time.time() + settings.AUTH_TOKEN_CACHE_TTL))))
+    return email
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
@@ -20,22 +51,30 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email = payload.get("sub")
-        if not isinstance(email, str):
+        email = _decode_token(token)
+        if email is None:
             raise credentials_exception
         token_data = TokenData(email=email)
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.email == token_data.email).first()
-    if user is None:
-        raise credentials_exception
-    return user
+    # Con el usuario en caché la solicitud no necesita una conexión a la base de datos
+    principal: Optional[Dict[str, Any]] = _principal_cache.get(token_data.email)
+    if principal is None:
+        user = db.query(User).filter(User.email == token_data.email).first()
+        if user is None:
+            raise credentials_exception
+        principal = user.dict()
+        principal.pop("hashed_password", None)
+        _principal_cache.set(token_data.email, principal)
+        return user
+
+    # Instancia nueva por solicitud (no vinculada a ninguna sesión)
+    return User(**principal)
 
 async def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
     if not current_user.is_active.scalar_value():
         raise HTTPException(status_code=400, detail="Usuario inactivo")
-    return current_user 
\ No newline at end of file
+    return current_user 
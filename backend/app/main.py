@@ -4,10 +4,17 @@ import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings, BASE_DIR
-from app.api import auth, users, alerts, review, notifications
+from app.core.responses import ORJSONResponse
+from app.middleware.compression import CompressionMiddleware
+from app.api import auth, users, alerts, review, notifications, system
 from app.scripts.create_initial_admin import create_initial_admin
 from app.opensearch.client import opensearch_client
 from app.services.alert_scheduler import alert_scheduler
+from app.services.smtp_pool import smtp_pool
+from app.services.notification_outbox import notification_outbox
+from app.services.review_import import review_import_service
+from app.core.security import password_executor
+from app.db.base import async_engine
 
 load_dotenv(BASE_DIR / ".env")
 
@@ -15,7 +22,8 @@ app = FastAPI(
     title=settings.PROJECT_NAME,
     description="API para el sistema de monitoreo de seguridad con Wazuh y OpenSearch",
     version=settings.VERSION,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=ORJSONResponse
 )
 
 # Configuración de CORS
@@ -27,6 +35,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compresión de respuestas (brotli o gzip según el cliente)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY
+)
+
 # Verificar conexión con OpenSearch
 opensearch_client.check_connection()
 
@@ -65,12 +81,33 @@ app.include_router(
     tags=["notifications"]
 )
 
+# Incluir las rutas de administración del sistema
+app.include_router(
+    system.router,
+    prefix=f"{settings.API_V1_STR}/system",
+    tags=["system"]
+)
+
 # Crear admin inicial si no existe
 create_initial_admin()
 
 # Iniciar el scheduler de alertas
 alert_scheduler.start(app)
 
+# Iniciar los workers de la cola de notificaciones
+notification_outbox.start(app)
+
+# Cancelar las importaciones a la cola de revisión en curso al apagar
+review_import_service.start(app)
+
+@app.on_event("shutdown")
+async def close_connection_pools():
+    """Cierra los pools de conexiones asíncronas (OpenSearch, SMTP, base de datos) y el pool de hashing"""
+    await opensearch_client.close()
+    await smtp_pool.close()
+    password_executor.shutdown(wait=False)
+    await async_engine.dispose()
+
 @app.get("/")
 async def root():
     return {
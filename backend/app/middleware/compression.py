@@ -0,0 +1,168 @@
+from typing import Optional, List, Tuple
+import zlib
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Tipos de contenido que ya vienen comprimidos (p. ej. la exportación Parquet con zstd)
+INCOMPRESSIBLE_TYPES = (
+    "application/vnd.apache.parquet",
+    "application/gzip",
+    "application/zip",
+    "image/",
+    "video/",
+    "audio/",
+)
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Elige la codificación según Accept-Encoding: brotli si el cliente la acepta,
+    si no gzip. Respeta q=0 y el comodín *. Retorna None si no acepta ninguna.
+    """
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    candidates: List[Tuple[float, str]] = []
+    for encoding in ("br", "gzip"):
+        quality = accepted.get(encoding, wildcard)
+        if quality > 0:
+            candidates.append((quality, encoding))
+    if not candidates:
+        return None
+    # A igual preferencia del cliente gana brotli (el primero en la lista)
+    return max(candidates, key=lambda candidate: candidate[0])[1]
+
+class _Compressor:
+    """Compresor incremental de gzip (zlib) o brotli con vaciado por fragmento"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            # wbits=31: formato gzip (encabezado y CRC) en lugar de zlib
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        """Comprime un fragmento y vacía el compresor para poder enviarlo en el momento"""
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        """Comprime el último fragmento y cierra el flujo"""
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_FINISH)
+
+class CompressionMiddleware:
+    """
+    Middleware que comprime las respuestas con brotli o gzip según el
+    Accept-Encoding del cliente. Las respuestas menores a `minimum_size` y las de
+    contenido ya comprimido se envían sin cambios. Las respuestas en streaming
+    (exportaciones) se comprimen fragmento por fragmento, sin acumular el cuerpo.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            encoding = negotiate_encoding(Headers(scope=scope).get("Accept-Encoding", ""))
+            if encoding:
+                responder = _CompressionResponder(self.app, self, encoding)
+                await responder(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+class _CompressionResponder:
+    """Intercepta los mensajes de una respuesta y decide si comprimirla"""
+
+    def __init__(self, app: ASGIApp, middleware: CompressionMiddleware, encoding: str):
+        self.app = app
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send: Send = _unattached_send
+        self.initial_message: Message = {}
+        self.started = False
+        self.passthrough = False
+        self.compressor: Optional[_Compressor] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    def _skip(self, headers: Headers) -> bool:
+        """Respuestas que no se comprimen: ya codificadas o de contenido comprimido"""
+        if "content-encoding" in headers:
+            return True
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(INCOMPRESSIBLE_TYPES)
+
+    async def send_compressed(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # Se retiene el inicio hasta saber si el cuerpo se comprime
+            self.initial_message = message
+            self.passthrough = self._skip(Headers(raw=message["headers"]))
+            return
+        if message_type != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self.started:
+            self.started = True
+            if self.passthrough or (len(body) < self.middleware.minimum_size and not more_body):
+                self.passthrough = True
+                await self.send(self.initial_message)
+                await self.send(message)
+                return
+
+            self.compressor = _Compressor(self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality)
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                # Streaming: la longitud final no se conoce
+                del headers["Content-Length"]
+                message["body"] = self.compressor.compress(body)
+            else:
+                message["body"] = self.compressor.finish(body)
+                headers["Content-Length"] = str(len(message["body"]))
+            await self.send(self.initial_message)
+            await self.send(message)
+            return
+
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        assert self.compressor is not None
+        message["body"] = self.compressor.compress(body) if more_body else self.compressor.finish(body)
+        await self.send(message)
+
+async def _unattached_send(message: Message) -> None:
+    raise RuntimeError("send no inicializado")
@@ -4,6 +4,12 @@ from app.models.alert_note import AlertNote
 from app.models.notification_email import NotificationEmail
 from app.models.notification_config import NotificationConfig
 from app.models.notification_history import NotificationHistory
+from app.models.notification_history_alert import NotificationHistoryAlert
+from app.models.alert_daily_rollup import AlertDailyRollup, RollupDimension
+from app.models.ingestion_checkpoint import IngestionCheckpoint
+from app.models.notification_outbox import NotificationOutbox, OutboxStatus
+from app.models.review_import_job import ReviewImportJob, ImportJobStatus
+from app.models.notification_pending import NotificationPending
 
 __all__ = [
     "User", "UserRole",
@@ -11,5 +17,11 @@ __all__ = [
     "AlertNote",
     "NotificationEmail",
     "NotificationConfig",
-    "NotificationHistory"
+    "NotificationHistory",
+    "NotificationHistoryAlert",
+    "AlertDailyRollup", "RollupDimension",
+    "IngestionCheckpoint",
+    "NotificationOutbox", "OutboxStatus",
+    "ReviewImportJob", "ImportJobStatus",
+    "NotificationPending"
 ] 
\ No newline at end of file
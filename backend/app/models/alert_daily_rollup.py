@@ -0,0 +1,29 @@
+from sqlalchemy import Column, String, Integer, Date, UniqueConstraint
+from enum import Enum as PyEnum
+from .base_model import Base
+
+class RollupDimension(str, PyEnum):
+    """Dimensiones por las que se agregan los conteos diarios"""
+    TOTAL = "total"
+    LEVEL = "level"
+    RULE = "rule"
+    AGENT = "agent"
+
+class AlertDailyRollup(Base):
+    """Modelo para los conteos diarios de alertas de días ya cerrados"""
+    __table_args__ = (
+        UniqueConstraint("day", "dimension", "key", name="uq_alertdailyrollup_day_dimension_key"),
+    )
+
+    # ID primario
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Día (UTC) al que corresponden los conteos
+    day = Column(Date, nullable=False, index=True)
+
+    # Dimensión (total, level, rule, agent) y valor de la dimensión
+    dimension = Column(String(16), nullable=False)
+    key = Column(String, nullable=False)
+
+    # Cantidad de alertas del día para esa dimensión y valor
+    count = Column(Integer, nullable=False, default=0)
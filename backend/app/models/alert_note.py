@@ -1,10 +1,19 @@
-from sqlalchemy import Column, String, ForeignKey, Integer
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, ForeignKey, Integer, Index, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from .base_model import Base
 from .user import User
 
+# Configuración de texto de las notas (escritas por los operadores en español)
+SEARCH_CONFIG = "spanish"
+
 class AlertNote(Base):
     """Modelo para notas asociadas a alertas gestionadas"""
+    __table_args__ = (
+        Index("ix_alertnote_alert_id_created_at", "alert_id", "created_at"),
+        # Búsqueda de texto completo en el contenido
+        Index("ix_alertnote_search_vector", "search_vector", postgresql_using="gin"),
+    )
     
     # ID primario
     id = Column(Integer, primary_key=True, index=True)
@@ -16,6 +25,13 @@ class AlertNote(Base):
     # Contenido de la nota
     content = Column(String, nullable=False)
     
+    # Vector de búsqueda del contenido (columna generada por Postgres)
+    # Diferida: solo se usa en las consultas de búsqueda, no se carga con la entidad
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(f"to_tsvector('{SEARCH_CONFIG}', coalesce(content, ''))", persisted=True)
+    ))
+    
     # Autor de la nota (referencia al usuario)
     author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     author = relationship("User", backref="alert_notes") 
\ No newline at end of file
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, Integer, BigInteger
+from .base_model import Base
+
+class IngestionCheckpoint(Base):
+    """Modelo para la última posición procesada por un job de ingesta de alertas"""
+
+    # ID primario
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Nombre del job que usa el checkpoint
+    name = Column(String(64), unique=True, nullable=False, index=True)
+
+    # Posición del último hit procesado (valores de ordenamiento de OpenSearch)
+    last_timestamp = Column(BigInteger, nullable=False)  # @timestamp en milisegundos
+    last_alert_id = Column(String, nullable=False, default="")  # Campo id de Wazuh (desempate)
@@ -1,7 +1,12 @@
-from sqlalchemy import Column, String, Integer, JSON, Enum, DateTime
+from sqlalchemy import Column, String, Integer, Enum, DateTime, Index, Computed
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import deferred
 from enum import Enum as PyEnum
 from .base_model import Base
 
+# Configuración de texto de las descripciones de reglas de Wazuh (en inglés)
+SEARCH_CONFIG = "english"
+
 class AlertState(str, PyEnum):
     """Estados posibles para una alerta gestionada"""
     OPEN = "abierta"
@@ -9,6 +14,30 @@ class AlertState(str, PyEnum):
 
 class ManagedAlert(Base):
     """Modelo para alertas que han sido gestionadas (abiertas o cerradas)"""
+    __table_args__ = (
+        # Cola de revisión: filtro por estado y paginación por (created_at, id)
+        Index("ix_managedalert_state_created_at_id", "state", "created_at", "id"),
+        Index("ix_managedalert_created_at_id", "created_at", "id"),
+        Index("ix_managedalert_agent_id_created_at", "agent_id", "created_at"),
+        Index("ix_managedalert_rule_level_created_at", "rule_level", "created_at"),
+        Index("ix_managedalert_timestamp", "timestamp"),
+        # Filtros por contenido del payload de Wazuh (operador @>)
+        Index(
+            "ix_managedalert_alert_data",
+            "alert_data",
+            postgresql_using="gin",
+            postgresql_ops={"alert_data": "jsonb_path_ops"}
+        ),
+        # Búsqueda de texto completo en la descripción de la regla
+        Index("ix_managedalert_search_vector", "search_vector", postgresql_using="gin"),
+        # Búsqueda por subcadena en el nombre del agente (requiere la extensión pg_trgm)
+        Index(
+            "ix_managedalert_agent_name_trgm",
+            "agent_name",
+            postgresql_using="gin",
+            postgresql_ops={"agent_name": "gin_trgm_ops"}
+        ),
+    )
     
     # ID primario
     id = Column(Integer, primary_key=True, index=True)
@@ -27,5 +56,12 @@ class ManagedAlert(Base):
     rule_level = Column(Integer, nullable=False)
     rule_description = Column(String, nullable=False)
     
+    # Vector de búsqueda de la descripción (columna generada por Postgres)
+    # Diferida: solo se usa en las consultas de búsqueda, no se carga con la entidad
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(f"to_tsvector('{SEARCH_CONFIG}', coalesce(rule_description, ''))", persisted=True)
+    ))
+    
     # Datos completos de la alerta (opcional, para no tener que consultar OpenSearch)
-    alert_data = Column(JSON, nullable=True) 
\ No newline at end of file
+    alert_data = Column(JSONB, nullable=True) 
\ No newline at end of file
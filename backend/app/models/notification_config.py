@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean
+from sqlalchemy import Column, Integer, String, Boolean, false
 from .base_model import Base
 
 class NotificationConfig(Base):
@@ -7,6 +7,12 @@ class NotificationConfig(Base):
     alert_threshold = Column(Integer, nullable=False, default=0)  # Nivel de alerta a partir del cual se envían notificaciones
     is_enabled = Column(Boolean, default=True, nullable=False)  # Para activar/desactivar todo el sistema de notificaciones
     
+    # Modo resumen: acumula alertas y envía un único correo por ventana de tiempo
+    # (server_default: valores para la configuración existente al agregar las columnas)
+    digest_enabled = Column(Boolean, nullable=False, default=False, server_default=false())
+    digest_window_seconds = Column(Integer, nullable=False, default=60, server_default="60")  # Tiempo máximo de acumulación
+    digest_max_alerts = Column(Integer, nullable=False, default=50, server_default="50")  # Cantidad que adelanta el envío
+    
     # Configuración SMTP (valores por defecto para Gmail)
     smtp_host = Column(String(255), nullable=False, default="smtp.gmail.com")
     smtp_port = Column(Integer, nullable=False, default=587)
@@ -21,4 +21,6 @@ class NotificationHistory(Base):
     
     # Relaciones
     alert = relationship("ManagedAlert", backref="notifications")
+    # Todas las alertas incluidas (en los resúmenes, alert_id es la primera)
+    alerts = relationship("ManagedAlert", secondary="notificationhistoryalert", viewonly=True)
     user = relationship("User", backref="sent_notifications") 
\ No newline at end of file
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, ForeignKey, UniqueConstraint
+from .base_model import Base
+
+class NotificationHistoryAlert(Base):
+    """Modelo que vincula una notificación con cada alerta incluida (resúmenes)"""
+    __table_args__ = (
+        UniqueConstraint("history_id", "alert_id", name="uq_notificationhistoryalert_history_alert"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    history_id = Column(Integer, ForeignKey("notificationhistory.id", ondelete="CASCADE"), nullable=False, index=True)
+    alert_id = Column(Integer, ForeignKey("managedalert.id", ondelete="CASCADE"), nullable=False, index=True)
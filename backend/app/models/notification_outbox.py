@@ -0,0 +1,35 @@
+from sqlalchemy import Column, String, Integer, ForeignKey, Text, DateTime, Index
+from sqlalchemy.orm import relationship
+from enum import Enum as PyEnum
+from datetime import datetime
+from .base_model import Base
+
+class OutboxStatus(str, PyEnum):
+    """Estados posibles de un envío en la cola de notificaciones"""
+    PENDING = "pendiente"  # Esperando su turno (o el próximo reintento)
+    SENDING = "enviando"  # Tomado por un worker hasta next_attempt_at
+    SENT = "enviado"
+    DEAD = "descartado"  # Sin más reintentos: requiere revisión manual
+
+class NotificationOutbox(Base):
+    """Modelo para los correos pendientes de envío (outbox de notificaciones)"""
+    __table_args__ = (
+        Index("ix_notificationoutbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    # ID primario (ID del job devuelto por la API)
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Registro del historial que se actualiza con el resultado del envío
+    history_id = Column(Integer, ForeignKey("notificationhistory.id", ondelete="CASCADE"), nullable=False, index=True)
+    history = relationship("NotificationHistory", backref="outbox")
+
+    # Mensaje MIME completo, listo para enviar
+    message = Column(Text, nullable=False)
+
+    # Estado del envío y reintentos
+    status = Column(String(16), nullable=False, default=OutboxStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_error = Column(Text, nullable=True)
+    sent_at = Column(DateTime, nullable=True)
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from .base_model import Base
+
+class NotificationPending(Base):
+    """Modelo para las alertas gestionadas que todavía no se incluyeron en una notificación"""
+
+    # ID primario (orden de llegada)
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Alerta a notificar; la fila se elimina en la misma transacción que encola el correo
+    alert_id = Column(Integer, ForeignKey("managedalert.id", ondelete="CASCADE"), nullable=False, unique=True, index=True)
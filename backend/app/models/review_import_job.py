@@ -0,0 +1,29 @@
+from sqlalchemy import Column, String, Integer, ForeignKey, Text, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+from enum import Enum as PyEnum
+from .base_model import Base
+
+class ImportJobStatus(str, PyEnum):
+    """Estados posibles de una importación de alertas a la cola de revisión"""
+    RUNNING = "en_curso"
+    COMPLETED = "completada"
+    FAILED = "fallida"
+
+class ReviewImportJob(Base):
+    """Modelo para las importaciones en segundo plano de alertas de OpenSearch a la cola de revisión"""
+
+    # ID primario (ID del job devuelto por la API)
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Usuario que inició la importación y filtros de búsqueda utilizados
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    filters = Column(JSONB, nullable=False)
+
+    # Estado y progreso
+    status = Column(String(16), nullable=False, default=ImportJobStatus.RUNNING)
+    total = Column(Integer, nullable=True)  # Alertas que coinciden con los filtros (se conoce tras la primera página)
+    processed = Column(Integer, nullable=False, default=0)  # Hits leídos de OpenSearch
+    created = Column(Integer, nullable=False, default=0)  # Alertas agregadas a la cola de revisión
+    skipped = Column(Integer, nullable=False, default=0)  # Ya gestionadas o con datos incompletos
+    error = Column(Text, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
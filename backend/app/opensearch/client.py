@@ -1,4 +1,4 @@
-from opensearchpy import OpenSearch, RequestsHttpConnection, OpenSearchException
+from opensearchpy import OpenSearch, AsyncOpenSearch, RequestsHttpConnection, AIOHttpConnection, OpenSearchException
 from app.core.config import settings
 from typing import Optional
 import ssl
@@ -12,6 +12,7 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 class OpenSearchClient:
     _instance: Optional['OpenSearchClient'] = None
     _client: Optional[OpenSearch] = None
+    _async_client: Optional[AsyncOpenSearch] = None
     _initialized: bool = False
 
     def __new__(cls):
@@ -19,46 +20,60 @@ class OpenSearchClient:
             cls._instance = super(OpenSearchClient, cls).__new__(cls)
         return cls._instance
 
+    def _build_client_args(self) -> dict:
+        """Arma los argumentos de conexión comunes a los clientes síncrono y asíncrono"""
+        ssl_context = ssl.create_default_context(cafile=settings.OPENSEARCH_CA_CERTS)
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_REQUIRED
+        
+        if not settings.OPENSEARCH_VERIFY_CERTS:
+            print("WARNING:  Verificación de certificados SSL desactivada")
+            ssl_context.verify_mode = ssl.CERT_NONE
+
+        # Preparar argumentos base
+        client_args = {
+            'hosts': [{
+                'host': settings.OPENSEARCH_HOST,
+                'port': settings.OPENSEARCH_PORT
+            }],
+            'http_auth': (settings.OPENSEARCH_USER, settings.OPENSEARCH_PASSWORD),
+            'use_ssl': settings.OPENSEARCH_USE_SSL,
+            'verify_certs': settings.OPENSEARCH_VERIFY_CERTS,
+            'ssl_assert_hostname': False,
+            'ssl_show_warn': False,
+            'timeout': 30
+        }
+
+        # Solo agregar certificados CA si la verificación está activada
+        if settings.OPENSEARCH_VERIFY_CERTS:
+            client_args['ca_certs'] = settings.OPENSEARCH_CA_CERTS
+            client_args['ssl_context'] = ssl_context
+        else:
+            # Si no verificamos certificados, usamos un contexto SSL sin verificación
+            client_args['ssl_context'] = ssl.create_default_context()
+            client_args['ssl_context'].check_hostname = False
+            client_args['ssl_context'].verify_mode = ssl.CERT_NONE
+
+        return client_args
+
     def _initialize_client(self):
-        """Inicializa el cliente de OpenSearch con la configuración del .env"""
+        """Inicializa los clientes de OpenSearch con la configuración del .env"""
         if self._initialized:
             return
 
         try:
-            ssl_context = ssl.create_default_context(cafile=settings.OPENSEARCH_CA_CERTS)
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_REQUIRED
-            
-            if not settings.OPENSEARCH_VERIFY_CERTS:
-                print("WARNING:  Verificación de certificados SSL desactivada")
-                ssl_context.verify_mode = ssl.CERT_NONE
-
-            # Preparar argumentos base
-            client_args = {
-                'hosts': [{
-                    'host': settings.OPENSEARCH_HOST,
-                    'port': settings.OPENSEARCH_PORT
-                }],
-                'http_auth': (settings.OPENSEARCH_USER, settings.OPENSEARCH_PASSWORD),
-                'use_ssl': settings.OPENSEARCH_USE_SSL,
-                'verify_certs': settings.OPENSEARCH_VERIFY_CERTS,
-                'ssl_assert_hostname': False,
-                'ssl_show_warn': False,
-                'connection_class': RequestsHttpConnection,
-                'timeout': 30
-            }
-
-            # Solo agregar certificados CA si la verificación está activada
-            if settings.OPENSEARCH_VERIFY_CERTS:
-                client_args['ca_certs'] = settings.OPENSEARCH_CA_CERTS
-                client_args['ssl_context'] = ssl_context
-            else:
-                # Si no verificamos certificados, usamos un contexto SSL sin verificación
-                client_args['ssl_context'] = ssl.create_default_context()
-                client_args['ssl_context'].check_hostname = False
-                client_args['ssl_context'].verify_mode = ssl.CERT_NONE
-
-            self._client = OpenSearch(**client_args)
+            client_args = self._build_client_args()
+            self._client = OpenSearch(
+                **client_args,
+                connection_class=RequestsHttpConnection
+            )
+            # Cliente asíncrono con su propio pool de conexiones (aiohttp) para
+            # no bloquear el event loop de uvicorn durante las consultas
+            self._async_client = AsyncOpenSearch(
+                **client_args,
+                connection_class=AIOHttpConnection,
+                maxsize=settings.OPENSEARCH_POOL_MAXSIZE
+            )
             self._initialized = True
             print("INFO:     Cliente OpenSearch inicializado exitosamente en", settings.OPENSEARCH_HOST, ":", settings.OPENSEARCH_PORT)
         except Exception as e:
@@ -74,6 +89,20 @@ class OpenSearchClient:
             raise Exception("El cliente OpenSearch no está inicializado correctamente")
         return self._client
 
+    @property
+    def async_client(self) -> AsyncOpenSearch:
+        """Retorna la instancia del cliente asíncrono de OpenSearch"""
+        if not self._initialized:
+            self._initialize_client()
+        if self._async_client is None:
+            raise Exception("El cliente OpenSearch asíncrono no está inicializado correctamente")
+        return self._async_client
+
+    async def close(self) -> None:
+        """Cierra el pool de conexiones del cliente asíncrono"""
+        if self._async_client is not None:
+            await self._async_client.close()
+
     def check_connection(self) -> bool:
         """Verifica la conexión con OpenSearch"""
         if not self._initialized:
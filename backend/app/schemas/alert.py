@@ -26,13 +26,31 @@ class Alert(BaseModel):
     decoder: Optional[Dict[str, Any]] = Field(None, description="Información del decoder")
     data: Optional[Dict[str, Any]] = Field(None, description="Datos adicionales de la alerta")
 
+class AlertSummary(BaseModel):
+    """Esquema reducido de una alerta para los listados (sin full_log, decoder ni data)"""
+    id: str = Field(..., description="ID único de la alerta en OpenSearch")
+    timestamp: datetime = Field(..., description="Timestamp de la alerta")
+    agent: WazuhAgent = Field(..., description="Información del agente")
+    rule: WazuhRule = Field(..., description="Información de la regla")
+    location: Optional[str] = Field(None, description="Ubicación de la alerta")
+    fields: Optional[Dict[str, Any]] = Field(None, description="Campos adicionales solicitados con `fields`, por ruta")
+
 class AlertResponse(BaseModel):
     """Esquema para la respuesta paginada de alertas"""
     total: int = Field(..., description="Total de alertas encontradas")
     alerts: List[Alert] = Field(..., description="Lista de alertas")
     page: int = Field(1, description="Página actual")
     size: int = Field(..., description="Tamaño de página")
-    
+    next_cursor: Optional[str] = Field(None, description="Cursor opaco para la siguiente página (solo en modo cursor)")
+
+class AlertSummaryResponse(BaseModel):
+    """Esquema para la respuesta paginada de alertas en modo resumen"""
+    total: int = Field(..., description="Total de alertas encontradas")
+    alerts: List[AlertSummary] = Field(..., description="Lista de alertas (modo resumen)")
+    page: int = Field(1, description="Página actual")
+    size: int = Field(..., description="Tamaño de página")
+    next_cursor: Optional[str] = Field(None, description="Cursor opaco para la siguiente página (solo en modo cursor)")
+
 class AlertFilters(BaseModel):
     """Esquema para los filtros de búsqueda de alertas"""
     agent_ids: Optional[List[str]] = Field(None, description="Lista de IDs de agentes")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
 from .alert import Alert
 
@@ -15,6 +15,14 @@ class ManagedAlertUpdate(BaseModel):
     """Esquema para actualizar una alerta gestionada"""
     state: str = Field(..., description="Nuevo estado de la alerta (abierta/cerrada)")
 
+class ManagedAlertBulkCreate(BaseModel):
+    """Esquema para crear varias alertas gestionadas en una solicitud"""
+    alerts: List[ManagedAlertCreate] = Field(..., min_length=1, description="Alertas a gestionar")
+
+class ManagedAlertBulkIds(BaseModel):
+    """Esquema para operar sobre varias alertas gestionadas por ID"""
+    ids: List[int] = Field(..., min_length=1, description="IDs de las alertas gestionadas")
+
 class ManagedAlertInDB(ManagedAlertBase):
     """Esquema para representar una alerta gestionada en la base de datos"""
     id: int = Field(..., description="ID de la alerta gestionada")
@@ -37,4 +45,52 @@ class ManagedAlertResponse(BaseModel):
     total: int = Field(..., description="Total de alertas encontradas")
     alerts: List[ManagedAlertInDB] = Field(..., description="Lista de alertas")
     page: int = Field(1, description="Página actual")
-    size: int = Field(..., description="Tamaño de página") 
\ No newline at end of file
+    size: int = Field(..., description="Tamaño de página")
+    total_is_estimate: bool = Field(False, description="El total es un tope y no el conteo exacto")
+    next_cursor: Optional[str] = Field(None, description="Cursor de la página siguiente (None si es la última)")
+
+class ManagedAlertBulkCreateResponse(BaseModel):
+    """Esquema para la respuesta de la creación en lote"""
+    created: List[ManagedAlertInDB] = Field(..., description="Alertas creadas")
+    skipped: int = Field(..., description="Alertas omitidas por estar ya gestionadas")
+
+class ManagedAlertBulkResult(BaseModel):
+    """Esquema para la respuesta de una operación en lote por ID"""
+    ids: List[int] = Field(..., description="IDs de las alertas afectadas")
+    not_found: List[int] = Field(..., description="IDs que no corresponden a ninguna alerta")
+
+class ManagedAlertImportJobResponse(BaseModel):
+    """Esquema para el estado de una importación de alertas por filtro"""
+    id: int = Field(..., description="ID del job de importación")
+    status: str = Field(..., description="Estado (en_curso/completada/fallida)")
+    filters: Dict[str, Any] = Field(..., description="Filtros de búsqueda utilizados")
+    total: Optional[int] = Field(None, description="Alertas que coinciden con los filtros")
+    processed: int = Field(..., description="Alertas leídas de OpenSearch")
+    created: int = Field(..., description="Alertas agregadas a la cola de revisión")
+    skipped: int = Field(..., description="Alertas omitidas (ya gestionadas o incompletas)")
+    error: Optional[str] = Field(None, description="Error que detuvo la importación")
+    created_at: datetime = Field(..., description="Fecha de inicio")
+    finished_at: Optional[datetime] = Field(None, description="Fecha de finalización")
+
+    class Config:
+        from_attributes = True
+
+class ManagedAlertSearchResult(ManagedAlertInDB):
+    """Esquema para un resultado de la búsqueda de texto completo"""
+    rank: float = Field(..., description="Relevancia del resultado")
+
+class ManagedAlertSearchResponse(BaseModel):
+    """Esquema para la respuesta de la búsqueda de texto completo"""
+    results: List[ManagedAlertSearchResult] = Field(..., description="Alertas ordenadas por relevancia")
+    size: int = Field(..., description="Tamaño de página")
+    next_cursor: Optional[str] = Field(None, description="Cursor de la página siguiente (None si es la última)")
+
+class ManagedAlertFilters(BaseModel):
+    """Filtros de la cola de revisión"""
+    state: Optional[str] = None
+    rule_levels: Optional[List[int]] = None
+    agent_ids: Optional[List[str]] = None
+    from_date: Optional[datetime] = None
+    to_date: Optional[datetime] = None
+    data_contains: Optional[Dict[str, Any]] = Field(None, description="Documento JSON contenido en alert_data (@>)")
+    data_match: Optional[List[Tuple[str, str]]] = Field(None, description="Pares (ruta, valor) sobre alert_data, p. ej. ('data.srcip', '10.0.0.1')") 
\ No newline at end of file
@@ -1,4 +1,5 @@
 from typing import List, Optional
+from datetime import datetime
 from pydantic import BaseModel, EmailStr, Field
 
 # Esquemas para NotificationEmail
@@ -25,6 +26,9 @@ class NotificationEmailResponse(NotificationEmailBase):
 class NotificationConfigBase(BaseModel):
     alert_threshold: int
     is_enabled: bool
+    digest_enabled: bool = False
+    digest_window_seconds: int = 60
+    digest_max_alerts: int = 50
     sender_email: EmailStr
     smtp_password: str
     sender_name: str
@@ -32,6 +36,9 @@ class NotificationConfigBase(BaseModel):
 class NotificationConfigUpdate(BaseModel):
     alert_threshold: Optional[int] = None
     is_enabled: Optional[bool] = None
+    digest_enabled: Optional[bool] = None
+    digest_window_seconds: Optional[int] = Field(default=None, ge=10)
+    digest_max_alerts: Optional[int] = Field(default=None, ge=1)
     sender_email: Optional[EmailStr] = None
     smtp_password: Optional[str] = None
     sender_name: Optional[str] = None
@@ -49,6 +56,9 @@ class NotificationConfigCreate(BaseModel):
     """Schema para crear una nueva configuración de notificaciones"""
     alert_threshold: int = Field(default=15, ge=0, le=15)  # Nivel mínimo de alerta para notificar
     is_enabled: bool = True
+    digest_enabled: bool = False  # Enviar un resumen por ventana en lugar de un correo por alerta
+    digest_window_seconds: int = Field(default=60, ge=10)
+    digest_max_alerts: int = Field(default=50, ge=1)
     sender_email: EmailStr
     smtp_password: str
     sender_name: str = "Sistema de Alertas de Seguridad TIF"
@@ -57,4 +67,22 @@ class NotificationConfigCreate(BaseModel):
 class NotificationSendRequest(BaseModel):
     alert_id: int
     recipient_ids: List[int]
-    message: Optional[str] = None 
\ No newline at end of file
+    message: Optional[str] = None
+
+class NotificationSendResponse(BaseModel):
+    message: str
+    job_id: int
+
+# Esquema para los envíos de la cola de notificaciones
+class NotificationJobResponse(BaseModel):
+    id: int
+    history_id: int
+    status: str
+    attempts: int
+    next_attempt_at: datetime
+    last_error: Optional[str] = None
+    sent_at: Optional[datetime] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True 
\ No newline at end of file
@@ -0,0 +1,124 @@
+"""
+Microbenchmark de la conversión de hits de OpenSearch en alertas: construcción de
+los modelos Pydantic hit por hit (comportamiento anterior) contra la validación
+por lotes de AlertService sobre documentos ya armados.
+
+Mide el costo por hit sobre una página de hits de alertas de Wazuh sintéticas
+(con full_log, decoder y data, como las que devuelve la vista completa).
+
+Uso: python app/scripts/benchmark_alert_parsing.py [tamaño_de_página] [repeticiones]
+"""
+import sys
+import os
+import time
+from datetime import datetime
+
+# Agregar el directorio raíz al path para poder importar app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from app.schemas.alert import Alert, WazuhAgent, WazuhRule
+from app.services.alert_service import alert_service
+
+
+def build_hits(count: int):
+    """Hits con la forma de los documentos de wazuh-alerts-*"""
+    return [
+        {
+            "_id": f"alerta-{idx}",
+            "_source": {
+                "@timestamp": f"2024-05-{idx % 28 + 1:02d}T12:{idx % 60:02d}:00.{idx % 1000:03d}Z",
+                "agent": {"id": f"{idx % 50:03d}", "name": f"agente-{idx % 50}", "ip": f"10.0.0.{idx % 250}"},
+                "rule": {
+                    "id": str(5700 + idx % 40),
+                    "level": idx % 16,
+                    "description": "sshd: authentication failed.",
+                    "groups": ["syslog", "sshd", "authentication_failed"]
+                },
+                "location": "/var/log/auth.log",
+                "full_log": f"May 10 12:00:00 host sshd[{idx}]: Failed password for invalid user admin from 192.168.1.{idx % 250} port 22 ssh2",
+                "decoder": {"parent": "sshd", "name": "sshd"},
+                "data": {"srcip": f"192.168.1.{idx % 250}", "srcport": "22", "dstuser": "admin"}
+            }
+        }
+        for idx in range(count)
+    ]
+
+
+def parse_hits_per_model(hits):
+    """Comportamiento anterior: tres modelos por hit y fromisoformat con reemplazo de Z"""
+    alerts = []
+    for hit in hits:
+        try:
+            source = hit["_source"]
+            if "agent" not in source:
+                continue
+            agent = WazuhAgent(
+                id=str(source["agent"].get("id", "")),
+                name=source["agent"].get("name", "Unknown"),
+                ip=source["agent"].get("ip")
+            )
+            if "rule" not in source:
+                continue
+            rule = WazuhRule(
+                id=str(source["rule"].get("id", "")),
+                level=int(source["rule"].get("level", 0)),
+                description=source["rule"].get("description", "No description available"),
+                groups=source["rule"].get("groups", [])
+            )
+            if "@timestamp" in source:
+                timestamp = datetime.fromisoformat(source["@timestamp"].replace("Z", "+00:00"))
+            else:
+                continue
+            alerts.append(Alert(
+                id=hit["_id"],
+                timestamp=timestamp,
+                agent=agent,
+                rule=rule,
+                full_log=source.get("full_log", "No log available"),
+                location=source.get("location"),
+                decoder=source.get("decoder"),
+                data=source.get("data")
+            ))
+        except Exception:
+            continue
+    return alerts
+
+
+def measure(parse, hits, repeat: int) -> float:
+    """Retorna el costo medio por hit en microsegundos"""
+    parse(hits)  # Calentamiento
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse(hits)
+    return (time.perf_counter() - start) / (repeat * len(hits)) * 1_000_000
+
+
+def run_benchmark(page_size: int = 100, repeat: int = 200):
+    hits = build_hits(page_size)
+    assert parse_hits_per_model(hits) == alert_service._parse_hits(hits)
+
+    print(f"Página de {page_size} hits, {repeat} repeticiones")
+    results = [
+        ("Modelos por hit (anterior)", measure(parse_hits_per_model, hits, repeat)),
+        ("Validación por lotes", measure(alert_service._parse_hits, hits, repeat)),
+        ("Validación por lotes, resumen", measure(alert_service._parse_summary_hits, hits, repeat)),
+    ]
+    for name, per_hit in results:
+        print(f"{name:<32} {per_hit:8.2f} µs/hit  {per_hit * page_size / 1000:8.3f} ms/página")
+
+
+if __name__ == "__main__":
+    size = 100
+    reps = 200
+    if len(sys.argv) > 1:
+        try:
+            size = int(sys.argv[1])
+        except ValueError:
+            pass
+    if len(sys.argv) > 2:
+        try:
+            reps = int(sys.argv[2])
+        except ValueError:
+            pass
+
+    run_benchmark(size, reps)
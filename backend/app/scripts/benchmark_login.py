@@ -0,0 +1,80 @@
+"""
+Benchmark de inicios de sesión concurrentes: verificación bcrypt en el event loop
+(comportamiento anterior) contra el pool de hashing dedicado.
+
+Mide el rendimiento (logins por segundo) y la demora máxima del event loop, que es
+lo que perciben las demás solicitudes mientras se procesa la ráfaga de logins.
+
+Uso: python app/scripts/benchmark_login.py [cantidad_de_logins]
+"""
+import sys
+import os
+import asyncio
+import time
+
+# Agregar el directorio raíz al path para poder importar app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from app.core.config import settings
+from app.core.security import pwd_context, verify_password, verify_password_async, password_executor
+
+PASSWORD = "contraseña-de-prueba"
+
+
+async def measure_loop_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """Retorna la mayor demora observada entre ticks del event loop"""
+    max_lag = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        max_lag = max(max_lag, time.perf_counter() - start - interval)
+    return max_lag
+
+
+async def login_blocking(hashed: str) -> bool:
+    """Comportamiento anterior: bcrypt dentro de la corrutina"""
+    return verify_password(PASSWORD, hashed)
+
+
+async def login_executor(hashed: str) -> bool:
+    """bcrypt en el pool de hashing"""
+    is_valid, _ = await verify_password_async(PASSWORD, hashed)
+    return is_valid
+
+
+async def run_burst(login, hashed: str, count: int):
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(stop))
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    results = await asyncio.gather(*[login(hashed) for _ in range(count)])
+    elapsed = time.perf_counter() - start
+    stop.set()
+    max_lag = await lag_task
+    assert all(results)
+    return elapsed, max_lag
+
+
+def run_benchmark(count: int = 20):
+    hashed = pwd_context.hash(PASSWORD)
+    print(f"{count} logins concurrentes, bcrypt con costo {settings.BCRYPT_ROUNDS}, "
+          f"{settings.PASSWORD_HASH_WORKERS} hilos de hashing")
+    for name, login in [
+        ("bcrypt en el event loop", login_blocking),
+        ("Pool de hashing", login_executor),
+    ]:
+        elapsed, max_lag = asyncio.run(run_burst(login, hashed, count))
+        print(f"{name:<26} {elapsed:7.3f} s  {count / elapsed:7.2f} logins/s  "
+              f"demora máx. del event loop {max_lag * 1000:8.1f} ms")
+    password_executor.shutdown()
+
+
+if __name__ == "__main__":
+    num = 20
+    if len(sys.argv) > 1:
+        try:
+            num = int(sys.argv[1])
+        except ValueError:
+            pass
+
+    run_benchmark(num)
@@ -0,0 +1,116 @@
+"""
+Benchmark de la serialización de respuestas de /alerts/ y /review: el camino de
+FastAPI anterior (revalidación con response_model, jsonable y json.dumps) contra
+ORJSONResponse con los modelos ya validados que retornan los servicios.
+
+Usa páginas sintéticas con datos completos (full_log, decoder y data), por lo que
+mide solo el costo de CPU de armar el cuerpo de la respuesta.
+
+Uso: python app/scripts/benchmark_serialization.py [tamaño_de_página] [repeticiones]
+"""
+import sys
+import os
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import Union
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+# Agregar el directorio raíz al path para poder importar app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from app.core.responses import ORJSONResponse
+from app.schemas.alert import AlertResponse, AlertSummaryResponse
+from app.schemas.managed_alert import ManagedAlertResponse
+from app.scripts.benchmark_alert_parsing import build_hits
+from app.services.alert_service import alert_service
+
+
+def build_pages(size: int):
+    """Página de /alerts/ y de /review con las mismas alertas"""
+    alerts = alert_service._parse_hits(build_hits(size))
+    alerts_page = AlertResponse(total=10 * size, alerts=alerts, page=1, size=size)
+    now = datetime.utcnow()
+    review_page = ManagedAlertResponse(
+        total=10 * size,
+        alerts=[
+            {
+                "id": idx + 1,
+                "alert_id": alert.id,
+                "state": "abierta",
+                "timestamp": alert.timestamp,
+                "agent_id": alert.agent.id,
+                "agent_name": alert.agent.name,
+                "rule_id": alert.rule.id,
+                "rule_level": alert.rule.level,
+                "rule_description": alert.rule.description,
+                "alert_data": json.loads(alert.model_dump_json()),
+                "created_at": now,
+                "updated_at": now
+            }
+            for idx, alert in enumerate(alerts)
+        ],
+        page=1,
+        size=size
+    )
+    return alerts_page, review_page
+
+
+async def render_before(field, content) -> bytes:
+    """Comportamiento anterior: validación con response_model y JSONResponse"""
+    serialized = await serialize_response(field=field, response_content=content, is_coroutine=True)
+    return JSONResponse(serialized).body
+
+
+async def render_after(field, content) -> bytes:
+    """El endpoint retorna ORJSONResponse con el modelo del servicio"""
+    return ORJSONResponse(content).body
+
+
+async def measure(render, field, content, repeat: int) -> float:
+    """Retorna el tiempo medio por respuesta en milisegundos"""
+    await render(field, content)  # Calentamiento
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await render(field, content)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+async def run_benchmark(size: int = 100, repeat: int = 200):
+    alerts_page, review_page = build_pages(size)
+    endpoints = [
+        ("/alerts/", create_response_field(name="alerts", type_=Union[AlertResponse, AlertSummaryResponse]), alerts_page),
+        ("/review", create_response_field(name="review", type_=ManagedAlertResponse), review_page),
+    ]
+
+    print(f"Páginas de {size} alertas con datos completos, {repeat} repeticiones")
+    for path, field, content in endpoints:
+        before_body = await render_before(field, content)
+        after_body = await render_after(field, content)
+        assert json.loads(before_body) == json.loads(after_body)
+
+        before = await measure(render_before, field, content, repeat)
+        after = await measure(render_after, field, content, repeat)
+        print(f"{path:<10} anterior {before:8.3f} ms   orjson {after:8.3f} ms   "
+              f"x{before / after:5.1f}   ({len(after_body) / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    num = 100
+    reps = 200
+    if len(sys.argv) > 1:
+        try:
+            num = int(sys.argv[1])
+        except ValueError:
+            pass
+    if len(sys.argv) > 2:
+        try:
+            reps = int(sys.argv[2])
+        except ValueError:
+            pass
+
+    asyncio.run(run_benchmark(num, reps))
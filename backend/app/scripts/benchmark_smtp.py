@@ -0,0 +1,114 @@
+"""
+Benchmark del envío de notificaciones: una conexión SMTP por correo (comportamiento
+anterior con smtplib) contra el pool de conexiones asíncronas de EmailService.
+
+Usa un servidor aiosmtpd local como reemplazo de Gmail, por lo que mide el costo de
+conexión y autenticación pero no la latencia de red ni el handshake TLS reales.
+
+Uso: python app/scripts/benchmark_smtp.py [cantidad_de_correos]
+"""
+import sys
+import os
+import asyncio
+import smtplib
+import time
+from email.mime.text import MIMEText
+
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult
+
+# Agregar el directorio raíz al path para poder importar app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from app.services.smtp_pool import SMTPConnectionPool
+
+HOST = "127.0.0.1"
+PORT = 8025
+USERNAME = "alertas@example.com"
+PASSWORD = "secret"
+
+
+class CountingHandler:
+    """Handler de aiosmtpd que solo cuenta los mensajes recibidos"""
+
+    def __init__(self):
+        self.received = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received += 1
+        return "250 OK"
+
+
+def accept_all(server, session, envelope, mechanism, auth_data):
+    return AuthResult(success=True)
+
+
+def build_message(idx: int) -> MIMEText:
+    msg = MIMEText(f"Alerta de prueba {idx}", "plain")
+    msg["From"] = f"Benchmark <{USERNAME}>"
+    msg["To"] = "soc@example.com"
+    msg["Subject"] = f"Alerta de Seguridad - Nivel 12 ({idx})"
+    return msg
+
+
+def send_one_connection_per_email(count: int) -> float:
+    """Comportamiento anterior: conectar, autenticar, enviar y cerrar por cada correo"""
+    start = time.perf_counter()
+    for idx in range(count):
+        server = smtplib.SMTP(HOST, PORT)
+        server.login(USERNAME, PASSWORD)
+        server.send_message(build_message(idx))
+        server.quit()
+    return time.perf_counter() - start
+
+
+async def send_with_pool(count: int, concurrent: bool) -> float:
+    """Envío reutilizando las conexiones del pool"""
+    pool = SMTPConnectionPool(max_size=3, idle_timeout=60)
+    start = time.perf_counter()
+    if concurrent:
+        await asyncio.gather(*[
+            pool.send(build_message(idx), HOST, PORT, USERNAME, PASSWORD)
+            for idx in range(count)
+        ])
+    else:
+        for idx in range(count):
+            await pool.send(build_message(idx), HOST, PORT, USERNAME, PASSWORD)
+    elapsed = time.perf_counter() - start
+    await pool.close()
+    return elapsed
+
+
+def run_benchmark(count: int = 50):
+    handler = CountingHandler()
+    controller = Controller(
+        handler,
+        hostname=HOST,
+        port=PORT,
+        authenticator=accept_all,
+        auth_require_tls=False
+    )
+    controller.start()
+    try:
+        print(f"Enviando {count} correos a un servidor SMTP local ({HOST}:{PORT})...")
+        results = [
+            ("Una conexión por correo (smtplib)", send_one_connection_per_email(count)),
+            ("Pool asíncrono, secuencial", asyncio.run(send_with_pool(count, concurrent=False))),
+            ("Pool asíncrono, concurrente", asyncio.run(send_with_pool(count, concurrent=True))),
+        ]
+        for name, elapsed in results:
+            print(f"{name:<36} {elapsed:8.3f} s  ({elapsed / count * 1000:6.2f} ms/correo)")
+        print(f"Mensajes recibidos por el servidor: {handler.received}")
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    num = 50
+    if len(sys.argv) > 1:
+        try:
+            num = int(sys.argv[1])
+        except ValueError:
+            pass
+
+    run_benchmark(num)
@@ -0,0 +1,170 @@
+from typing import Optional, List, Dict, Any, AsyncIterator
+from contextlib import aclosing
+import asyncio
+import csv
+import io
+import json
+
+from app.core.config import settings
+from app.schemas.alert import Alert, AlertFilters
+from app.services.alert_service import alert_service
+
+class _ChunkSink:
+    """
+    Destino de escritura para Parquet que acumula los bytes escritos hasta que se
+    retiran con `drain`. `tell` informa la posición absoluta en el archivo, que el
+    escritor usa para los offsets de los row groups del pie.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+class AlertExportService:
+    """
+    Exportación de alertas de OpenSearch en NDJSON, CSV o Parquet. Las alertas se
+    recorren por lotes sobre un point-in-time y cada lote se serializa y se envía
+    antes de pedir el siguiente, por lo que la memoria usada no depende del
+    tamaño de la exportación.
+    """
+
+    FORMATS = {
+        "ndjson": ("application/x-ndjson", "ndjson"),
+        "csv": ("text/csv; charset=utf-8", "csv"),
+        "parquet": ("application/vnd.apache.parquet", "parquet"),
+    }
+
+    CSV_COLUMNS = [
+        "id", "timestamp", "agent_id", "agent_name", "agent_ip", "rule_id", "rule_level",
+        "rule_description", "rule_groups", "location", "full_log", "decoder", "data"
+    ]
+
+    def __init__(self, batch_size: int):
+        self.batch_size = batch_size
+
+    async def _batches(self, filters: Optional[AlertFilters]) -> AsyncIterator[List[Alert]]:
+        """
+        Lotes de alertas del filtro. Usado con aclosing, el point-in-time se
+        libera en el momento aunque se corte la descarga.
+        """
+        async with aclosing(alert_service.scan_alerts(filters, self.batch_size, track_total_hits=False)) as batches:
+            async for alerts, _, _ in batches:
+                if alerts:
+                    yield alerts
+
+    def _row(self, alert: Alert) -> Dict[str, Any]:
+        """Aplana una alerta en una fila de columnas simples (decoder y data como JSON)"""
+        return {
+            "id": alert.id,
+            "timestamp": alert.timestamp,
+            "agent_id": alert.agent.id,
+            "agent_name": alert.agent.name,
+            "agent_ip": alert.agent.ip,
+            "rule_id": alert.rule.id,
+            "rule_level": alert.rule.level,
+            "rule_description": alert.rule.description,
+            "rule_groups": alert.rule.groups,
+            "location": alert.location,
+            "full_log": alert.full_log,
+            "decoder": json.dumps(alert.decoder) if alert.decoder is not None else None,
+            "data": json.dumps(alert.data) if alert.data is not None else None,
+        }
+
+    def export(self, filters: Optional[AlertFilters], format: str) -> AsyncIterator[bytes]:
+        """Retorna el generador de bytes de la exportación en el formato indicado"""
+        if format == "ndjson":
+            return self._export_ndjson(filters)
+        if format == "csv":
+            return self._export_csv(filters)
+        if format == "parquet":
+            return self._export_parquet(filters)
+        raise ValueError(f"Formato de exportación no soportado: {format}")
+
+    async def _export_ndjson(self, filters: Optional[AlertFilters]) -> AsyncIterator[bytes]:
+        """Una alerta por línea, con la misma estructura que la API de alertas"""
+        async with aclosing(self._batches(filters)) as batches:
+            async for alerts in batches:
+                yield "".join(alert.model_dump_json() + "\n" for alert in alerts).encode("utf-8")
+
+    async def _export_csv(self, filters: Optional[AlertFilters]) -> AsyncIterator[bytes]:
+        """CSV con encabezado; los grupos de la regla se separan con ';'"""
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=self.CSV_COLUMNS)
+        writer.writeheader()
+        async with aclosing(self._batches(filters)) as batches:
+            async for alerts in batches:
+                for alert in alerts:
+                    row = self._row(alert)
+                    row["timestamp"] = alert.timestamp.isoformat()
+                    row["rule_groups"] = ";".join(alert.rule.groups)
+                    writer.writerow(row)
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+        # Solo el encabezado si no hubo alertas
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+
+    def _parquet_schema(self):
+        import pyarrow as pa
+
+        return pa.schema([
+            ("id", pa.string()),
+            ("timestamp", pa.timestamp("ms", tz="UTC")),
+            ("agent_id", pa.string()),
+            ("agent_name", pa.string()),
+            ("agent_ip", pa.string()),
+            ("rule_id", pa.string()),
+            ("rule_level", pa.int32()),
+            ("rule_description", pa.string()),
+            ("rule_groups", pa.list_(pa.string())),
+            ("location", pa.string()),
+            ("full_log", pa.string()),
+            ("decoder", pa.string()),  # JSON
+            ("data", pa.string()),  # JSON
+        ])
+
+    async def _export_parquet(self, filters: Optional[AlertFilters]) -> AsyncIterator[bytes]:
+        """
+        Parquet con un row group por lote. La codificación corre en un hilo para no
+        bloquear el event loop; los bytes de cada row group se envían al terminarlo.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = self._parquet_schema()
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema, compression="zstd")
+        try:
+            async with aclosing(self._batches(filters)) as batches:
+                async for alerts in batches:
+                    rows = [self._row(alert) for alert in alerts]
+                    table = pa.Table.from_pylist(rows, schema=schema)
+                    await asyncio.to_thread(writer.write_table, table)
+                    yield sink.drain()
+        finally:
+            # Escribe el pie del archivo (esquema y ubicación de los row groups)
+            writer.close()
+        yield sink.drain()
+
+# Instancia global del servicio
+alert_export_service = AlertExportService(batch_size=settings.ALERT_EXPORT_BATCH_SIZE)
@@ -1,17 +1,25 @@
-from typing import Optional, List
+from typing import Optional, List, Any, Tuple
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import FastAPI
 from app.services.alert_service import alert_service
 from app.services.review_service import review_service
 from app.services.email_service import EmailService
-from app.models.user import User
-from app.db.base import SessionLocal
+from app.services.rollup_service import alert_rollup_service
+from app.services.notification_digest import notification_digest
+from app.services.notification_outbox import notification_outbox
+from app.core.config import settings
+from app.models.ingestion_checkpoint import IngestionCheckpoint
+from app.models.managed_alert import ManagedAlert
+from app.models.notification_pending import NotificationPending
+from app.db.base import AsyncSessionLocal
 from app.schemas.alert import AlertFilters
 from app.schemas.managed_alert import ManagedAlertCreate
+from app.services.email_service import NotificationContext
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 # Configurar el logger para mostrar timestamp
 # logging.basicConfig(
@@ -21,22 +29,93 @@ from datetime import datetime
 logger = logging.getLogger(__name__)
 
 class AlertSchedulerService:
+    CHECKPOINT_NAME = "process_new_alerts"
+
     def __init__(self):
         self.scheduler: Optional[AsyncIOScheduler] = None
         self.job = None
         # logger.info("AlertSchedulerService inicializado")
 
+    async def _get_checkpoint(self, db: AsyncSession) -> IngestionCheckpoint:
+        """
+        Obtiene el checkpoint de ingesta. Si no existe, lo crea apuntando al
+        inicio de la ventana inicial configurada.
+        """
+        checkpoint = await db.scalar(
+            select(IngestionCheckpoint).where(IngestionCheckpoint.name == self.CHECKPOINT_NAME)
+        )
+        if checkpoint is None:
+            start = datetime.now(timezone.utc) - timedelta(minutes=settings.INGESTION_INITIAL_LOOKBACK_MINUTES)
+            checkpoint = IngestionCheckpoint()
+            setattr(checkpoint, 'name', self.CHECKPOINT_NAME)
+            setattr(checkpoint, 'last_timestamp', int(start.timestamp() * 1000))
+            setattr(checkpoint, 'last_alert_id', "")
+            db.add(checkpoint)
+            await db.commit()
+        return checkpoint
+
+    async def _save_checkpoint(self, db: AsyncSession, checkpoint: IngestionCheckpoint, sort_values: List[Any]) -> None:
+        """Guarda la posición del último hit procesado"""
+        setattr(checkpoint, 'last_timestamp', int(sort_values[0]))
+        setattr(checkpoint, 'last_alert_id', str(sort_values[1] or ""))
+        await db.commit()
+
+    async def _notify_pending(self, db: AsyncSession, context: NotificationContext) -> Tuple[int, int]:
+        """
+        Encola una notificación por cada alerta pendiente. Las que no se pueden
+        encolar (error o falta de destinatarios o usuario) siguen pendientes y se
+        reintentan en la próxima ejecución.
+        Retorna la cantidad de correos encolados y de alertas procesadas.
+        """
+        # logger.info("Obteniendo destinatarios de email y usuario para registro...")
+        recipients: List[str] = context.recipients
+        user = context.sender_user
+        if not recipients or not user:
+            # logger.warning("⚠️ No hay destinatarios o usuario configurados: las alertas quedan pendientes")
+            return 0, 0
+
+        pending_alerts = list((await db.scalars(
+            select(ManagedAlert)
+            .join(NotificationPending, NotificationPending.alert_id == ManagedAlert.id)
+            .order_by(NotificationPending.id)
+        )).all())
+
+        emails_queued = 0
+        alerts_processed = 0
+        for managed_alert in pending_alerts:
+            try:
+                # logger.info(f"Encolando notificación de la alerta {managed_alert.alert_id}...")
+                job, error = await db.run_sync(
+                    EmailService.enqueue_alert_notification,
+                    alert=managed_alert,
+                    user=user,
+                    recipients=recipients
+                )
+                if job is None:
+                    # logger.error(f"❌ Error al encolar notificación: {error}")
+                    continue
+                emails_queued += 1
+                alerts_processed += 1
+            except Exception as e:
+                # logger.error(f"❌ Error procesando alerta {getattr(managed_alert, 'alert_id', 'unknown')}: {str(e)}")
+                await db.rollback()
+        return emails_queued, alerts_processed
+
     async def process_new_alerts(self):
         """
-        Procesa nuevas alertas de OpenSearch que superen el umbral configurado
+        Procesa las alertas de OpenSearch que superen el umbral configurado,
+        avanzando con search_after desde el último checkpoint persistido
         """
         # logger.info("=== Iniciando proceso de nuevas alertas ===")
         start_time = datetime.now()
         
-        db: Session = SessionLocal()
+        db: AsyncSession = AsyncSessionLocal()
         try:
             # logger.info("1. Verificando configuración de email...")
-            config = EmailService.get_config(db)
+            # Configuración, destinatarios y usuario se cargan una vez por ejecución (cacheados).
+            # EmailService es síncrono: se ejecuta sobre la misma conexión asíncrona con run_sync
+            context = await db.run_sync(EmailService.get_context)
+            config = context.config
             is_valid, error_message = EmailService.validate_config(config)
             
             if not is_valid:
@@ -51,90 +130,76 @@ class AlertSchedulerService:
             alert_threshold = getattr(config, 'alert_threshold')
             # logger.info(f"✅ Umbral de alertas configurado: {alert_threshold}")
             
-            # logger.info("2. Buscando alertas en OpenSearch...")
-            filters = AlertFilters(
-                rule_levels=[level for level in range(alert_threshold, 16)],
-                agent_ids=None,
-                rule_groups=None,
-                from_date=None,
-                to_date=None,
-                search_term=None,
-                alert_id=None
-            )
-            
-            alerts_response = await alert_service.get_alerts(
-                page=1,
-                size=20,
-                filters=filters
-            )
-            
-            if not alerts_response or not hasattr(alerts_response, 'alerts'):
-                # logger.info("❌ No se encontraron alertas nuevas")
-                return
-            
-            total_alerts = len(alerts_response.alerts)
-            # logger.info(f"✅ Se encontraron {total_alerts} alertas para procesar")
+            # logger.info("2. Buscando alertas nuevas desde el último checkpoint...")
+            checkpoint = await self._get_checkpoint(db)
+            search_after = [checkpoint.last_timestamp, checkpoint.last_alert_id]
+            batch_size = settings.INGESTION_BATCH_SIZE
+            # Las alertas más recientes que el margen se dejan para la próxima ejecución: una
+            # alerta indexada con retraso todavía puede aparecer antes de ellas en el orden.
+            # El checkpoint nunca pasa de este límite.
+            ingest_until = datetime.now(timezone.utc) - timedelta(seconds=settings.INGESTION_SAFETY_LAG_SECONDS)
+            digest_enabled = getattr(config, 'digest_enabled', False)
             
+            total_alerts = 0
             alerts_processed = 0
             alerts_saved = 0
-            emails_sent = 0
+            emails_queued = 0
             
-            # logger.info("3. Procesando alertas encontradas...")
-            for idx, alert in enumerate(alerts_response.alerts, 1):
-                try:
-                    # logger.info(f"\n--- Procesando alerta {idx}/{total_alerts} ---")
-                    # logger.info(f"ID: {alert.id}")
-                    # logger.info(f"Nivel: {alert.rule.level}")
-                    # logger.info(f"Descripción: {alert.rule.description}")
-                    
-                    alert_create = ManagedAlertCreate(
-                        alert_id=alert.id,
-                        alert_data=alert
-                    )
-                    
-                    # logger.info("4. Intentando guardar alerta en DB...")
-                    managed_alert = await review_service.create_managed_alert(db, alert_create)
-                    if not managed_alert:
-                        # logger.info("⚠️ La alerta ya existe en la DB, saltando...")
-                        continue
-                    
-                    # logger.info("✅ Alerta guardada exitosamente")
-                    alerts_saved += 1
-                    
-                    # logger.info("5. Obteniendo destinatarios de email...")
-                    recipients: List[str] = [str(email.email) for email in EmailService.get_active_recipients(db)]
-                    if not recipients:
-                        # logger.warning("⚠️ No hay destinatarios configurados para las notificaciones")
-                        continue
-                    # logger.info(f"✅ Destinatarios encontrados: {len(recipients)}")
-                    
-                    # logger.info("6. Obteniendo usuario para registro...")
-                    user = db.query(User).first()
-                    if not user:
-                        # logger.error("❌ No se encontró un usuario para registrar la notificación")
-                        continue
-                    # logger.info(f"✅ Usuario seleccionado: {user.email}")
-                    
-                    # logger.info("7. Enviando notificación por email...")
-                    success, error = EmailService.send_alert_notification(
-                        db=db,
-                        alert=managed_alert,
-                        user=user,
-                        recipients=recipients
-                    )
-                    
-                    if not success:
-                        # logger.error(f"❌ Error al enviar notificación: {error}")
-                        pass
-                    else:
-                        # logger.info("✅ Email enviado exitosamente")
-                        emails_sent += 1
-                    
-                    alerts_processed += 1
-                    
-                except Exception as e:
-                    # logger.error(f"❌ Error procesando alerta {getattr(alert, 'id', 'unknown')}: {str(e)}")
-                    continue
+            # Avanzar lote a lote hasta alcanzar el límite de la ejecución
+            while True:
+                filters = AlertFilters(
+                    rule_levels=[level for level in range(alert_threshold, 16)],
+                    agent_ids=None,
+                    rule_groups=None,
+                    from_date=datetime.fromtimestamp(checkpoint.last_timestamp / 1000, tz=timezone.utc),
+                    to_date=ingest_until,
+                    search_term=None,
+                    alert_id=None
+                )
+                
+                alerts, last_sort, hits_read = await alert_service.get_alerts_after(
+                    filters=filters,
+                    search_after=search_after,
+                    size=batch_size
+                )
+                
+                if hits_read == 0:
+                    # logger.info("❌ No se encontraron alertas nuevas")
+                    break
+                
+                total_alerts += len(alerts)
+                # logger.info(f"✅ Se encontraron {len(alerts)} alertas para procesar")
+                
+                # logger.info("3. Guardando las alertas del lote en DB...")
+                # Las alertas nuevas quedan pendientes de notificación en la misma transacción,
+                # así que el checkpoint puede avanzar aunque después falle algún envío
+                managed_alerts = await review_service.create_managed_alerts_bulk(
+                    db,
+                    [ManagedAlertCreate(alert_id=alert.id, alert_data=alert) for alert in alerts],
+                    notify=True
+                )
+                alerts_saved += len(managed_alerts)
+                # logger.info(f"✅ {len(managed_alerts)} alertas nuevas guardadas, el resto ya existía")
+
+                # Persistir el checkpoint recién después de guardar el lote
+                await self._save_checkpoint(db, checkpoint, last_sort)
+                search_after = last_sort
+                
+                if hits_read < batch_size:
+                    break
+
+            # logger.info("4. Encolando las notificaciones pendientes...")
+            if digest_enabled:
+                # Modo resumen: las alertas pendientes se envían juntas al cumplirse la ventana
+                queued, error = await notification_digest.flush(db, config)
+                if queued:
+                    emails_queued += 1
+            else:
+                queued, processed = await self._notify_pending(db, context)
+                emails_queued += queued
+                alerts_processed += processed
+                if queued:
+                    notification_outbox.wake()
 
             end_time = datetime.now()
             duration = (end_time - start_time).total_seconds()
@@ -144,16 +209,60 @@ class AlertSchedulerService:
             # logger.info(f"Alertas encontradas: {total_alerts}")
             # logger.info(f"Alertas procesadas: {alerts_processed}")
             # logger.info(f"Alertas guardadas: {alerts_saved}")
-            # logger.info(f"Emails enviados: {emails_sent}")
+            # logger.info(f"Emails encolados: {emails_queued}")
             # logger.info("================================")
 
         except Exception as e:
             # logger.error(f"❌ Error general en el procesamiento de alertas: {str(e)}")
             pass
         finally:
-            db.close()
+            await db.close()
             # logger.info("Conexión a DB cerrada")
 
+    async def flush_notification_digest(self):
+        """Encola el resumen de alertas pendiente cuando corresponde"""
+        db: AsyncSession = AsyncSessionLocal()
+        try:
+            queued, error = await notification_digest.flush(db)
+            if error:
+                # logger.error(f"❌ Error al enviar el resumen de alertas: {error}")
+                pass
+        except Exception as e:
+            # logger.error(f"❌ Error enviando el resumen de alertas: {str(e)}")
+            pass
+        finally:
+            await db.close()
+
+    async def rollup_closed_days(self):
+        """
+        Guarda en Postgres los conteos diarios de los días cerrados que todavía
+        no tienen rollup, dentro de la ventana de retención configurada.
+        """
+        db: AsyncSession = AsyncSessionLocal()
+        try:
+            # Los rollups y los índices diarios de OpenSearch usan días UTC
+            now = datetime.now(timezone.utc)
+            # Un día se considera cerrado pasado el margen para alertas que llegan tarde
+            last_closed_day = (now - timedelta(minutes=settings.ROLLUP_GRACE_MINUTES)).date() - timedelta(days=1)
+            first_day = now.date() - timedelta(days=settings.ROLLUP_RETENTION_DAYS)
+
+            await db.run_sync(alert_rollup_service.purge_before, first_day)
+            rolled_up_days = await db.run_sync(alert_rollup_service.get_rolled_up_days, first_day, last_closed_day)
+
+            day = last_closed_day
+            while day >= first_day:
+                if day not in rolled_up_days:
+                    day_start = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+                    counts, per_day = await alert_service.aggregate_counts(day_start, day_start + timedelta(days=1))
+                    await db.run_sync(alert_rollup_service.save_day, day, counts, per_day.get(day, 0))
+                day -= timedelta(days=1)
+
+        except Exception as e:
+            # logger.error(f"❌ Error generando los rollups diarios: {str(e)}")
+            pass
+        finally:
+            await db.close()
+
     def start(self, app: Optional[FastAPI] = None):
         """Inicia el scheduler"""
         if self.scheduler:
@@ -169,6 +278,23 @@ class AlertSchedulerService:
             name='Procesar nuevas alertas de OpenSearch',
             replace_existing=True
         )
+
+        self.scheduler.add_job(
+            self.flush_notification_digest,
+            trigger=IntervalTrigger(seconds=10),
+            id='flush_notification_digest',
+            name='Enviar resumen de alertas pendiente',
+            replace_existing=True
+        )
+
+        self.scheduler.add_job(
+            self.rollup_closed_days,
+            trigger=IntervalTrigger(hours=1),
+            id='rollup_closed_days',
+            name='Guardar rollups diarios de alertas',
+            replace_existing=True,
+            next_run_time=datetime.now()
+        )
         
         self.scheduler.start()
         # logger.info("✅ Scheduler de alertas iniciado - ejecutando cada 1 minuto")
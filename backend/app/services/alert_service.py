@@ -1,13 +1,52 @@
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from datetime import datetime, timedelta, timezone, date
+from typing import Optional, List, Dict, Any, Set, Callable, Awaitable, Tuple, AsyncIterator, Union
+from collections import defaultdict, Counter
+import asyncio
+import base64
+import calendar
+import json
+import re
+import time
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.base import AsyncSessionLocal
+from app.models.alert_daily_rollup import RollupDimension
 from app.opensearch.client import opensearch_client
-from app.schemas.alert import Alert, AlertResponse, AlertFilters, WazuhAgent, WazuhRule
+from app.schemas.alert import Alert, AlertResponse, AlertFilters, AlertSummary, AlertSummaryResponse
+from app.services.rollup_service import alert_rollup_service, DimensionCounts
 from opensearchpy.exceptions import NotFoundError
+from pydantic import TypeAdapter, ValidationError
+
+# Validación por lotes de las alertas de una página
+_alerts_adapter = TypeAdapter(List[Alert])
+_summaries_adapter = TypeAdapter(List[AlertSummary])
 
 class AlertService:
+    # Campos de _source que usa el parser de alertas: el resto del documento
+    # (manager, predecoder, syscheck, mitre, etc.) no se descarga
+    ALERT_SOURCE_FIELDS = [
+        "@timestamp", "agent.id", "agent.name", "agent.ip",
+        "rule.id", "rule.level", "rule.description", "rule.groups",
+        "location", "full_log", "decoder", "data"
+    ]
+    # Modo resumen: sin full_log, decoder ni data, que suelen ocupar varios KB por alerta
+    SUMMARY_SOURCE_FIELDS = ALERT_SOURCE_FIELDS[:9]
+    FIELD_PATH = re.compile(r"^[\w@-]+(\.[\w@-]+)*$")
+    MAX_EXTRA_FIELDS = 20
+
     def __init__(self):
-        self.client = opensearch_client.client
+        self.client = opensearch_client.async_client
         self.index_pattern = "wazuh-alerts-*"
+        # Caché de los índices diarios existentes (se refresca periódicamente)
+        self._existing_indices: Optional[Set[str]] = None
+        self._indices_loaded_at: float = 0.0
+        self._indices_loaded_day: Optional[date] = None  # Día UTC en que se cargó el listado
+        self._indices_lock = asyncio.Lock()
+        # Caché de estadísticas del dashboard por ventana (semanal/mensual/N días)
+        self._stats_cache = TTLCache(ttl=settings.STATS_CACHE_TTL, maxsize=32)
+        self._stats_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        # Alertas convertidas y descartadas al leer hits de OpenSearch
+        self._parse_stats: Counter = Counter()
 
     def _get_index_pattern(self, from_date: Optional[datetime] = None, to_date: Optional[datetime] = None) -> str:
         """
@@ -52,6 +91,99 @@ class AlertService:
         # Caso por defecto: usar patrón general
         return self.index_pattern
 
+    async def _get_existing_indices(self) -> Optional[Set[str]]:
+        """
+        Obtiene el conjunto de índices de alertas existentes.
+        El listado se cachea y se refresca cada OPENSEARCH_INDEX_CACHE_TTL segundos.
+        Retorna None si nunca se pudo obtener el listado.
+        """
+        if self._existing_indices is not None and \
+                time.monotonic() - self._indices_loaded_at < settings.OPENSEARCH_INDEX_CACHE_TTL:
+            return self._existing_indices
+
+        async with self._indices_lock:
+            # Otra corrutina pudo haber refrescado la caché mientras esperábamos
+            if self._existing_indices is not None and \
+                    time.monotonic() - self._indices_loaded_at < settings.OPENSEARCH_INDEX_CACHE_TTL:
+                return self._existing_indices
+            try:
+                rows = await self.client.cat.indices(index=self.index_pattern, format="json", h="index")
+            except NotFoundError:
+                rows = []
+            except Exception:
+                # Si OpenSearch no responde, seguir usando el último listado conocido
+                return self._existing_indices
+            self._existing_indices = {row["index"] for row in rows}
+            self._indices_loaded_at = time.monotonic()
+            self._indices_loaded_day = datetime.now(timezone.utc).date()
+            return self._existing_indices
+
+    def _invalidate_indices_cache(self) -> None:
+        """Fuerza el refresco del listado de índices en la próxima consulta"""
+        self._indices_loaded_at = 0.0
+
+    def _index_day(self, value: datetime) -> date:
+        """Día (UTC) del índice diario que contiene el timestamp"""
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.date()
+
+    async def _resolve_indices(self, from_date: Optional[datetime] = None, to_date: Optional[datetime] = None) -> Optional[str]:
+        """
+        Resuelve la lista exacta de índices diarios que cubren el rango de fechas,
+        intersectada con los índices que realmente existen.
+
+        Returns:
+            str: Índices separados por coma (los meses cubiertos por completo se
+                 compactan como `wazuh-alerts-YYYY.MM.*` para acotar el largo de la URL)
+            None: Si ningún índice existente cubre el rango
+        """
+        if not from_date and not to_date:
+            return self.index_pattern
+
+        existing = await self._get_existing_indices()
+        if existing is None:
+            return self._get_index_pattern(from_date, to_date)
+
+        start = self._index_day(from_date) if from_date else None
+        end = self._index_day(to_date) if to_date else None
+        prefix = self.index_pattern.rstrip("*")
+
+        months: Dict[str, List[str]] = defaultdict(list)
+        for name in existing:
+            try:
+                day = datetime.strptime(name[len(prefix):], "%Y.%m.%d").date()
+            except ValueError:
+                # Índices que no siguen el formato diario
+                continue
+            if (start is None or day >= start) and (end is None or day <= end):
+                months[day.strftime("%Y.%m")].append(name)
+
+        # Los índices diarios creados después de cargar el listado (p. ej. tras la
+        # medianoche UTC) todavía no figuran en la caché. Se agregan con un comodín
+        # por día, que no falla si el índice aún no existe (tampoco al abrir un
+        # point-in-time, a diferencia de un nombre exacto)
+        if self._indices_loaded_day is not None:
+            day = max(start, self._indices_loaded_day) if start else self._indices_loaded_day
+            last_day = min(end, datetime.now(timezone.utc).date()) if end else datetime.now(timezone.utc).date()
+            while day <= last_day:
+                name = f"{prefix}{day.strftime('%Y.%m.%d')}"
+                if name not in existing:
+                    months[day.strftime("%Y.%m")].append(f"{name}*")
+                day += timedelta(days=1)
+
+        indices = []
+        for year_month in sorted(months):
+            year, month = (int(part) for part in year_month.split("."))
+            first_day = date(year, month, 1)
+            last_day = date(year, month, calendar.monthrange(year, month)[1])
+            if (start is None or start <= first_day) and (end is None or end >= last_day):
+                indices.append(f"{prefix}{year_month}.*")
+            else:
+                indices.extend(sorted(months[year_month]))
+
+        return ",".join(indices) if indices else None
+
     def _build_query(self, filters: Optional[AlertFilters] = None) -> Dict[str, Any]:
         """Construye la consulta de OpenSearch basada en los filtros proporcionados"""
         must_conditions = []
@@ -93,249 +225,605 @@ class AlertService:
             }
         }
 
+    def _source_includes(self, summary: bool, fields: Optional[List[str]] = None) -> List[str]:
+        """Campos de _source a descargar según el modo y los campos adicionales pedidos"""
+        if not summary:
+            return list(self.ALERT_SOURCE_FIELDS)
+        fields = fields or []
+        if len(fields) > self.MAX_EXTRA_FIELDS:
+            raise ValueError(f"Se admiten como máximo {self.MAX_EXTRA_FIELDS} campos adicionales")
+        for field in fields:
+            if not self.FIELD_PATH.match(field):
+                raise ValueError(f"Campo inválido: {field}")
+        return self.SUMMARY_SOURCE_FIELDS + [field for field in fields if field not in self.SUMMARY_SOURCE_FIELDS]
+
+    def _encode_cursor(self, pit_id: str, search_after: List[Any], total: int, page: int) -> str:
+        """Codifica el estado de la paginación en un cursor opaco"""
+        payload = json.dumps({"pit": pit_id, "after": search_after, "total": total, "page": page})
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+    def _decode_cursor(self, cursor: str) -> Dict[str, Any]:
+        """Decodifica un cursor generado por _encode_cursor"""
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            if not payload.get("pit") or not isinstance(payload.get("after"), list):
+                raise ValueError
+            return payload
+        except Exception:
+            raise ValueError("Cursor inválido")
+
+    async def _close_point_in_time(self, pit_id: str) -> None:
+        """Libera un point-in-time que ya no se va a utilizar"""
+        try:
+            await self.client.delete_pit(body={"pit_id": [pit_id]})
+        except Exception:
+            pass
+
     async def get_alerts(
         self,
         page: int = 1,
         size: int = 10,
-        filters: Optional[AlertFilters] = None
-    ) -> AlertResponse:
+        filters: Optional[AlertFilters] = None,
+        cursor: Optional[str] = None,
+        view: str = "full",
+        fields: Optional[List[str]] = None
+    ) -> Union[AlertResponse, AlertSummaryResponse]:
         """
-        Obtiene las alertas de Wazuh desde OpenSearch con paginación y filtros
+        Obtiene las alertas de Wazuh desde OpenSearch con paginación y filtros.
+
+        Con `view="summary"` solo se descargan los campos del listado y se retorna
+        el esquema reducido; `fields` agrega rutas de _source puntuales
+        (p. ej. data.srcip) al resumen e implica ese modo.
+
+        Si se indica `cursor`, se usa paginación con point-in-time + search_after
+        en lugar de from/size: "*" abre una nueva sesión de navegación y cualquier
+        otro valor debe ser el `next_cursor` devuelto por la página anterior.
+        Todas las páginas de una sesión ven la misma instantánea de los índices.
         """
         try:
             # Construir la consulta base
             query = self._build_query(filters)
+            summary = view == "summary" or bool(fields)
+            query["_source"] = {"includes": self._source_includes(summary, fields)}
+            response_class = AlertSummaryResponse if summary else AlertResponse
             
+            # Agregar ordenamiento por timestamp
+            query["sort"] = [{"@timestamp": {"order": "desc"}}]
+
+            if cursor is not None:
+                return await self._get_alerts_page_with_cursor(query, size, filters, cursor, summary, fields)
+
             # Agregar paginación
             from_idx = (page - 1) * size
             query["size"] = size
             query["from"] = from_idx
-            
-            # Agregar ordenamiento por timestamp
-            query["sort"] = [{"@timestamp": {"order": "desc"}}]
-
-            # Obtener el patrón de índice basado en las fechas de filtro
-            try:
-                index_pattern = self._get_index_pattern(
-                    from_date=filters.from_date if filters else None,
-                    to_date=filters.to_date if filters else None
-                )
 
+            # Obtener los índices que cubren las fechas de filtro
+            index_pattern = await self._resolve_indices(
+                from_date=filters.from_date if filters else None,
+                to_date=filters.to_date if filters else None
+            )
+            if index_pattern is None:
+                return response_class(total=0, alerts=[], page=page, size=size)
 
+            try:
                 # Ejecutar la consulta
-                response = self.client.search(
+                response = await self.client.search(
                     index=index_pattern,
-                    body=query
+                    body=query,
+                    ignore_unavailable=True
                 )
 
             except NotFoundError:
-                return AlertResponse(
+                self._invalidate_indices_cache()
+                return response_class(
                     total=0,
                     alerts=[],
                     page=page,
                     size=size
                 )
 
-            # Procesar resultados
-            total = response["hits"]["total"]["value"]
-            alerts = []
-
-            for hit in response["hits"]["hits"]:
-                try:
-                    source = hit["_source"]
-                    
-                    # Verificar y estructurar los datos del agente
-                    if "agent" not in source:
-                        continue
-
-                    # Crear objeto WazuhAgent
-                    agent = WazuhAgent(
-                        id=str(source["agent"].get("id", "")),
-                        name=source["agent"].get("name", "Unknown"),
-                        ip=source["agent"].get("ip")
-                    )
-
-                    # Verificar y estructurar los datos de la regla
-                    if "rule" not in source:
-                        continue
-
-                    # Crear objeto WazuhRule
-                    rule = WazuhRule(
-                        id=str(source["rule"].get("id", "")),
-                        level=int(source["rule"].get("level", 0)),
-                        description=source["rule"].get("description", "No description available"),
-                        groups=source["rule"].get("groups", [])
-                    )
-
-                    # Convertir el timestamp
-                    if "@timestamp" in source:
-                        timestamp = datetime.fromisoformat(
-                            source["@timestamp"].replace("Z", "+00:00")
-                        )
-                    else:
-                        continue
-
-                    # Crear objeto Alert con los objetos validados
-                    alert = Alert(
-                        id=hit["_id"],
-                        timestamp=timestamp,
-                        agent=agent,
-                        rule=rule,
-                        full_log=source.get("full_log", "No log available"),
-                        location=source.get("location"),
-                        decoder=source.get("decoder"),
-                        data=source.get("data")
-                    )
-                    alerts.append(alert)
-                except Exception as e:
-                    continue
-
-            return AlertResponse(
-                total=total,
-                alerts=alerts,
+            hits = response["hits"]["hits"]
+            return response_class(
+                total=response["hits"]["total"]["value"],
+                alerts=self._parse_summary_hits(hits, fields) if summary else self._parse_hits(hits),  # type: ignore
                 page=page,
                 size=size
             )
 
+        except ValueError:
+            raise
         except Exception as e:
             raise Exception(f"Error al obtener alertas: {str(e)}")
 
-    async def get_weekly_alert_stats(self) -> Dict[str, Any]:
+    async def get_alerts_after(
+        self,
+        filters: Optional[AlertFilters],
+        search_after: Optional[List[Any]],
+        size: int
+    ) -> Tuple[List[Alert], Optional[List[Any]], int]:
         """
-        Obtiene estadísticas de las alertas de la última semana.
+        Obtiene alertas en orden cronológico a partir de la posición `search_after`
+        ([@timestamp en ms, id de Wazuh]), para ingesta incremental.
+
+        Returns:
+            Tuple: alertas parseadas, valores de ordenamiento del último hit leído
+                   y cantidad de hits leídos (incluye los que no se pudieron parsear)
         """
+        query = self._build_query(filters)
+        query["_source"] = {"includes": self._source_includes(summary=False)}
+        query["size"] = size
+        query["sort"] = [
+            {"@timestamp": {"order": "asc"}},
+            {"id": {"order": "asc", "unmapped_type": "keyword"}}
+        ]
+        query["track_total_hits"] = False
+        if search_after:
+            query["search_after"] = search_after
+
+        index_pattern = await self._resolve_indices(
+            from_date=filters.from_date if filters else None,
+            to_date=filters.to_date if filters else None
+        )
+        if index_pattern is None:
+            return [], search_after, 0
+
         try:
-            now = datetime.now()
-            start_of_week = now - timedelta(days=7)
-            
-            query = {
-                "size": 0,
-                "query": {
-                    "range": {
-                        "@timestamp": {
-                            "gte": start_of_week.isoformat(),
-                            "lte": now.isoformat()
-                        }
-                    }
-                },
-                "aggs": {
-                    "rule_levels": {
-                        "terms": {
-                            "field": "rule.level",
-                            "size": 15
-                        }
-                    },
-                    "top_rules": {
-                        "terms": {
-                            "field": "rule.description.keyword",
-                            "size": 10
-                        }
-                    },
-                    "alerts_over_time": {
-                        "date_histogram": {
-                            "field": "@timestamp",
-                            "fixed_interval": "1d",
-                            "format": "yyyy-MM-dd",
-                            "min_doc_count": 0,
-                            "extended_bounds": {
-                                "min": start_of_week.strftime("%Y-%m-%d"),
-                                "max": now.strftime("%Y-%m-%d")
-                            }
-                        }
-                    }
-                }
-            }
+            response = await self.client.search(
+                index=index_pattern,
+                body=query,
+                ignore_unavailable=True
+            )
+        except NotFoundError:
+            self._invalidate_indices_cache()
+            return [], search_after, 0
 
-            response = self.client.search(
-                index="wazuh-alerts-*",
-                body=query
+        hits = response["hits"]["hits"]
+        if not hits:
+            return [], search_after, 0
+        return self._parse_hits(hits), hits[-1]["sort"], len(hits)
+
+    async def scan_alerts(
+        self,
+        filters: Optional[AlertFilters],
+        batch_size: int,
+        track_total_hits: bool = True
+    ) -> AsyncIterator[Tuple[List[Alert], int, int]]:
+        """
+        Recorre todas las alertas que coinciden con los filtros, en lotes, sobre un
+        point-in-time con search_after (una instantánea consistente de los índices).
+        El point-in-time se libera al terminar o al abandonar el recorrido
+        (usar contextlib.aclosing para liberarlo en el momento).
+        Sin `track_total_hits` el total informado es 0.
+
+        Yields:
+            Tuple: alertas parseadas del lote, total de coincidencias y cantidad
+                   de hits leídos en el lote (incluye los que no se pudieron parsear)
+        """
+        index_pattern = await self._resolve_indices(
+            from_date=filters.from_date if filters else None,
+            to_date=filters.to_date if filters else None
+        )
+        if index_pattern is None:
+            return
+
+        keep_alive = settings.OPENSEARCH_PIT_KEEP_ALIVE
+        try:
+            pit = await self.client.create_pit(index=index_pattern, keep_alive=keep_alive)
+        except NotFoundError:
+            self._invalidate_indices_cache()
+            return
+        pit_id = pit["pit_id"]
+
+        query = self._build_query(filters)
+        query["_source"] = {"includes": self._source_includes(summary=False)}
+        query["size"] = batch_size
+        query["sort"] = [
+            {"@timestamp": {"order": "asc"}},
+            {"id": {"order": "asc", "unmapped_type": "keyword"}}
+        ]
+        query["track_total_hits"] = track_total_hits
+        total: Optional[int] = None
+        try:
+            while True:
+                query["pit"] = {"id": pit_id, "keep_alive": keep_alive}
+                response = await self.client.search(body=query)
+                pit_id = response.get("pit_id", pit_id)
+                hits = response["hits"]["hits"]
+                if total is None:
+                    total = response["hits"].get("total", {}).get("value", 0)
+                    # El total solo se calcula en la primera página
+                    query["track_total_hits"] = False
+                if not hits:
+                    return
+                yield self._parse_hits(hits), total, len(hits)
+                if len(hits) < batch_size:
+                    return
+                query["search_after"] = hits[-1]["sort"]
+        finally:
+            await self._close_point_in_time(pit_id)
+
+    async def _get_alerts_page_with_cursor(
+        self,
+        query: Dict[str, Any],
+        size: int,
+        filters: Optional[AlertFilters],
+        cursor: str,
+        summary: bool = False,
+        fields: Optional[List[str]] = None
+    ) -> Union[AlertResponse, AlertSummaryResponse]:
+        """
+        Obtiene una página usando point-in-time + search_after.
+        El costo por página es constante sin importar la profundidad.
+        """
+        response_class = AlertSummaryResponse if summary else AlertResponse
+        keep_alive = settings.OPENSEARCH_PIT_KEEP_ALIVE
+        query["sort"].append({"id": {"order": "desc", "unmapped_type": "keyword"}})
+        query["size"] = size
+
+        if cursor == "*":
+            # Nueva sesión: abrir el point-in-time sobre los índices del rango
+            index_pattern = await self._resolve_indices(
+                from_date=filters.from_date if filters else None,
+                to_date=filters.to_date if filters else None
             )
-            
-            if response["hits"]["total"]["value"] == 0:
+            if index_pattern is None:
+                return response_class(total=0, alerts=[], page=1, size=size)
+            try:
+                pit = await self.client.create_pit(index=index_pattern, keep_alive=keep_alive)
+            except NotFoundError:
+                self._invalidate_indices_cache()
+                return response_class(total=0, alerts=[], page=1, size=size)
+            pit_id = pit["pit_id"]
+            total = None
+            page = 1
+        else:
+            state = self._decode_cursor(cursor)
+            pit_id = state["pit"]
+            total = state.get("total")
+            page = int(state.get("page", 1))
+            query["search_after"] = state["after"]
+            # El total ya se calculó en la primera página de la sesión
+            query["track_total_hits"] = False
+
+        query["pit"] = {"id": pit_id, "keep_alive": keep_alive}
+
+        try:
+            response = await self.client.search(body=query)
+        except NotFoundError:
+            raise ValueError("El cursor expiró, vuelva a iniciar la búsqueda")
+
+        hits = response["hits"]["hits"]
+        if total is None:
+            total = response["hits"]["total"]["value"]
+
+        next_cursor = None
+        if len(hits) == size:
+            next_cursor = self._encode_cursor(
+                response.get("pit_id", pit_id), hits[-1]["sort"], total, page + 1
+            )
+        else:
+            # Última página: liberar el point-in-time en lugar de esperar su expiración
+            await self._close_point_in_time(pit_id)
+
+        return response_class(
+            total=total,
+            alerts=self._parse_summary_hits(hits, fields) if summary else self._parse_hits(hits),  # type: ignore
+            page=page,
+            size=size,
+            next_cursor=next_cursor
+        )
+
+    def _hit_document(self, hit: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Arma el documento (dict) de una alerta a partir de un hit, con los campos
+        comunes a Alert y AlertSummary. No construye modelos: la validación se hace
+        en un único paso por página. Retorna None si faltan el agente, la regla o
+        el timestamp.
+        """
+        source = hit.get("_source") or {}
+        agent = source.get("agent")
+        rule = source.get("rule")
+        timestamp = source.get("@timestamp")
+        if not isinstance(agent, dict) or not isinstance(rule, dict) or timestamp is None:
+            return None
+
+        return {
+            "id": hit.get("_id"),
+            # Pydantic interpreta el ISO 8601 de OpenSearch (incluido el sufijo Z)
+            "timestamp": timestamp,
+            "agent": {
+                "id": str(agent.get("id", "")),
+                "name": agent.get("name", "Unknown"),
+                "ip": agent.get("ip")
+            },
+            "rule": {
+                "id": str(rule.get("id", "")),
+                "level": rule.get("level", 0),
+                "description": rule.get("description", "No description available"),
+                "groups": rule.get("groups", [])
+            },
+            "location": source.get("location")
+        }
+
+    def _validate_documents(self, adapter: TypeAdapter, documents: List[Dict[str, Any]], hits_read: int) -> List[Any]:
+        """
+        Valida todos los documentos de la página en una sola llamada. Si alguno es
+        inválido se descartan solo esos (según el índice informado por Pydantic) y
+        se valida el resto. Actualiza los contadores de documentos descartados.
+        """
+        self._parse_stats["incomplete"] += hits_read - len(documents)
+        try:
+            parsed = adapter.validate_python(documents)
+        except ValidationError as e:
+            invalid = {error["loc"][0] for error in e.errors() if error["loc"]}
+            self._parse_stats["invalid"] += len(invalid)
+            parsed = adapter.validate_python([doc for idx, doc in enumerate(documents) if idx not in invalid])
+        self._parse_stats["parsed"] += len(parsed)
+        return parsed
+
+    def _parse_hits(self, hits: List[Dict[str, Any]]) -> List[Alert]:
+        """Convierte los hits de OpenSearch en objetos Alert"""
+        documents = []
+        for hit in hits:
+            document = self._hit_document(hit)
+            if document is None:
+                continue
+            source = hit["_source"]
+            document["full_log"] = source.get("full_log", "No log available")
+            document["decoder"] = source.get("decoder")
+            document["data"] = source.get("data")
+            documents.append(document)
+        return self._validate_documents(_alerts_adapter, documents, len(hits))
+
+    @staticmethod
+    def _get_path(source: Dict[str, Any], path: str) -> Any:
+        """Obtiene el valor de una ruta con puntos (a.b.c) dentro de _source"""
+        value: Any = source
+        for key in path.split("."):
+            if not isinstance(value, dict) or key not in value:
+                return None
+            value = value[key]
+        return value
+
+    def _parse_summary_hits(self, hits: List[Dict[str, Any]], fields: Optional[List[str]] = None) -> List[AlertSummary]:
+        """Convierte los hits de OpenSearch en objetos AlertSummary con los campos adicionales pedidos"""
+        documents = []
+        for hit in hits:
+            document = self._hit_document(hit)
+            if document is None:
+                continue
+            if fields:
+                document["fields"] = {field: self._get_path(hit["_source"], field) for field in fields}
+            documents.append(document)
+        return self._validate_documents(_summaries_adapter, documents, len(hits))
+
+    def get_parse_stats(self, reset: bool = False) -> Dict[str, int]:
+        """Contadores de alertas convertidas y descartadas (incompletas o inválidas) de este worker"""
+        stats = {key: self._parse_stats[key] for key in ("parsed", "incomplete", "invalid")}
+        if reset:
+            self._parse_stats.clear()
+        return stats
+
+    async def _get_cached_stats(
+        self,
+        window: str,
+        compute: Callable[[datetime], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """
+        Retorna las estadísticas de la ventana desde la caché o las calcula.
+        Las solicitudes concurrentes que no encuentran la entrada esperan a un
+        único cálculo y comparten su resultado.
+        """
+        cached = self._stats_cache.get(window)
+        if cached is not None:
+            return cached
+
+        async with self._stats_locks[window]:
+            cached = self._stats_cache.peek(window)
+            if cached is not None:
+                return cached
+            # Alinear el rango al minuto para que todas las solicitudes compartan los mismos límites.
+            # En UTC, igual que los rollups diarios y los índices de OpenSearch
+            now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+            result = await compute(now)
+            self._stats_cache.set(window, result)
+            return result
+
+    def get_stats_cache_info(self) -> Dict[str, Any]:
+        """Contadores de aciertos y fallos de la caché de estadísticas"""
+        return self._stats_cache.stats()
+
+    async def get_weekly_alert_stats(self) -> Dict[str, Any]:
+        """
+        Obtiene estadísticas de las alertas de la última semana (cacheadas).
+        """
+        return await self._get_cached_stats("weekly", self._compute_weekly_alert_stats)
+
+    async def get_monthly_alert_stats(self) -> Dict[str, Any]:
+        """
+        Obtiene estadísticas de las alertas de los últimos 30 días (cacheadas).
+        """
+        return await self._get_cached_stats("monthly", self._compute_monthly_alert_stats)
+
+    async def get_alert_stats(self, days: int) -> Dict[str, Any]:
+        """
+        Obtiene estadísticas de las alertas de los últimos `days` días (cacheadas).
+        """
+        async def compute(now: datetime) -> Dict[str, Any]:
+            try:
+                return await self._compute_alert_stats(now, days)
+            except Exception as e:
+                raise Exception(f"Error al obtener estadísticas: {str(e)}")
+
+        return await self._get_cached_stats(f"{days}d", compute)
+
+    async def _compute_weekly_alert_stats(self, now: datetime) -> Dict[str, Any]:
+        """
+        Calcula las estadísticas de las alertas de la última semana.
+        """
+        try:
+            stats = await self._compute_alert_stats(now, days=7)
+            if stats["total_alerts"] == 0:
                 return {
                     "rule_levels": [],
                     "top_rules": [],
                     "alerts_over_time": []
                 }
-
-            return {
-                "rule_levels": response["aggregations"]["rule_levels"]["buckets"],
-                "top_rules": response["aggregations"]["top_rules"]["buckets"],
-                "alerts_over_time": response["aggregations"]["alerts_over_time"]["buckets"]
-            }
+            return stats
 
         except Exception as e:
             raise Exception(f"Error al obtener estadísticas semanales: {str(e)}")
 
-    async def get_monthly_alert_stats(self) -> Dict[str, Any]:
+    async def _compute_monthly_alert_stats(self, now: datetime) -> Dict[str, Any]:
         """
-        Obtiene estadísticas de las alertas de los últimos 30 días.
+        Calcula las estadísticas de las alertas de los últimos 30 días.
         """
         try:
-            # Configurar rango de fechas para los últimos 30 días
-            now = datetime.now()
-            start_date = now - timedelta(days=30)
-            
-            query = {
-                "size": 0,
-                "query": {
-                    "range": {
-                        "@timestamp": {
-                            "gte": start_date.isoformat(),
-                            "lte": now.isoformat()
-                        }
+            stats = await self._compute_alert_stats(now, days=30)
+            if stats["total_alerts"] == 0:
+                return {
+                    "message": "No existen alertas para los últimos 30 días.",
+                    "error": "no_alerts_found"
+                }
+            return stats
+
+        except Exception as e:
+            raise Exception(f"Error al obtener estadísticas: {str(e)}")
+
+    def _day_start(self, day: date) -> datetime:
+        """Inicio (00:00 UTC) del día indicado"""
+        return datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+
+    async def aggregate_counts(self, start: datetime, end: datetime) -> Tuple[DimensionCounts, Dict[date, int]]:
+        """
+        Agrega en OpenSearch las alertas de [start, end) por nivel, regla y agente.
+        Retorna los conteos por dimensión y el total de cada día.
+        """
+        counts: DimensionCounts = {
+            RollupDimension.LEVEL.value: Counter(),
+            RollupDimension.RULE.value: Counter(),
+            RollupDimension.AGENT.value: Counter()
+        }
+        per_day: Dict[date, int] = {}
+
+        index = await self._resolve_indices(start, end)
+        if index is None:
+            return counts, per_day
+
+        query = {
+            "size": 0,
+            "query": {
+                "range": {
+                    "@timestamp": {
+                        "gte": start.isoformat(),
+                        "lt": end.isoformat()
                     }
+                }
+            },
+            "aggs": {
+                RollupDimension.LEVEL.value: {
+                    "terms": {"field": "rule.level", "size": 20}
+                },
+                RollupDimension.RULE.value: {
+                    "terms": {"field": "rule.description.keyword", "size": settings.ROLLUP_TERMS_SIZE}
                 },
-                "aggs": {
-                    "rule_levels": {
-                        "terms": {
-                            "field": "rule.level",
-                            "size": 15
-                        }
-                    },
-                    "top_rules": {
-                        "terms": {
-                            "field": "rule.description.keyword",
-                            "size": 10
-                        }
-                    },
-                    "alerts_over_time": {
-                        "date_histogram": {
-                            "field": "@timestamp",
-                            "fixed_interval": "1d",
-                            "format": "yyyy-MM-dd",
-                            "min_doc_count": 0,
-                            "extended_bounds": {
-                                "min": start_date.strftime("%Y-%m-%d"),
-                                "max": now.strftime("%Y-%m-%d")
-                            }
-                        }
+                RollupDimension.AGENT.value: {
+                    "terms": {"field": "agent.id", "size": settings.ROLLUP_TERMS_SIZE}
+                },
+                "per_day": {
+                    "date_histogram": {
+                        "field": "@timestamp",
+                        "calendar_interval": "1d",
+                        "format": "yyyy-MM-dd",
+                        "min_doc_count": 1
                     }
                 }
             }
+        }
 
-            response = self.client.search(
-                index="wazuh-alerts-*",
-                body=query
-            )
+        response = await self.client.search(
+            index=index,
+            body=query,
+            ignore_unavailable=True
+        )
+        aggregations = response.get("aggregations", {})
 
-            # Verificar si hay resultados
-            total_hits = response["hits"]["total"]["value"]
-            if total_hits == 0:
-                return {
-                    "message": "No existen alertas para los últimos 30 días.",
-                    "error": "no_alerts_found"
-                }
+        for dimension, counter in counts.items():
+            for bucket in aggregations.get(dimension, {}).get("buckets", []):
+                counter[str(bucket["key"])] += bucket["doc_count"]
+        for bucket in aggregations.get("per_day", {}).get("buckets", []):
+            day = datetime.strptime(bucket["key_as_string"], "%Y-%m-%d").date()
+            per_day[day] = bucket["doc_count"]
 
-            return {
-                "total_alerts": total_hits,
-                "rule_levels": response["aggregations"]["rule_levels"]["buckets"],
-                "top_rules": response["aggregations"]["top_rules"]["buckets"],
-                "alerts_over_time": response["aggregations"]["alerts_over_time"]["buckets"]
-            }
+        return counts, per_day
 
-        except Exception as e:
-            raise Exception(f"Error al obtener estadísticas: {str(e)}")
+    async def _compute_alert_stats(self, now: datetime, days: int) -> Dict[str, Any]:
+        """
+        Calcula las estadísticas de los últimos `days` días combinando los conteos
+        de días cerrados guardados en Postgres con una única agregación en
+        OpenSearch para el resto del rango (normalmente solo el día actual).
+        """
+        today = now.date()
+        start_day = (now - timedelta(days=days)).date()
+        last_closed_day = today - timedelta(days=1)
+
+        counts: DimensionCounts = {
+            RollupDimension.LEVEL.value: Counter(),
+            RollupDimension.RULE.value: Counter(),
+            RollupDimension.AGENT.value: Counter()
+        }
+        per_day: Dict[date, int] = {}
+
+        # Usar los conteos guardados hasta el primer día cerrado que aún no tenga rollup
+        first_live_day = start_day
+        # El servicio de rollups es síncrono: se ejecuta sobre la conexión asíncrona con run_sync
+        async with AsyncSessionLocal() as db:
+            try:
+                rolled_up_days = await db.run_sync(
+                    alert_rollup_service.get_rolled_up_days, start_day, last_closed_day
+                )
+                while first_live_day <= last_closed_day and first_live_day in rolled_up_days:
+                    first_live_day += timedelta(days=1)
+                if first_live_day > start_day:
+                    counts, per_day = await db.run_sync(
+                        alert_rollup_service.get_counts, start_day, first_live_day - timedelta(days=1)
+                    )
+            except Exception:
+                # Sin acceso a los rollups se calcula todo el rango en OpenSearch
+                first_live_day = start_day
+
+        live_counts, live_per_day = await self.aggregate_counts(self._day_start(first_live_day), now)
+        for dimension, counter in live_counts.items():
+            counts[dimension].update(counter)
+        per_day.update(live_per_day)
+
+        alerts_over_time = []
+        day = start_day
+        while day <= today:
+            alerts_over_time.append({
+                "key_as_string": day.isoformat(),
+                "key": int(self._day_start(day).timestamp() * 1000),
+                "doc_count": per_day.get(day, 0)
+            })
+            day += timedelta(days=1)
+
+        return {
+            "total_alerts": sum(per_day.values()),
+            "rule_levels": [
+                {"key": int(level), "doc_count": count}
+                for level, count in counts[RollupDimension.LEVEL.value].most_common(15)
+            ],
+            "top_rules": [
+                {"key": rule, "doc_count": count}
+                for rule, count in counts[RollupDimension.RULE.value].most_common(10)
+            ],
+            "top_agents": [
+                {"key": agent, "doc_count": count}
+                for agent, count in counts[RollupDimension.AGENT.value].most_common(10)
+            ],
+            "alerts_over_time": alerts_over_time
+        }
 
 # Instancia global del servicio
 alert_service = AlertService() 
\ No newline at end of file
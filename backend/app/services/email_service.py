@@ -1,5 +1,6 @@
-from typing import List, Optional, Tuple
-import smtplib
+from typing import List, Optional, Tuple, Dict, NamedTuple
+from collections import defaultdict
+from datetime import datetime
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from sqlalchemy.orm import Session
@@ -8,13 +9,52 @@ from sqlalchemy import select
 from app.models.notification_config import NotificationConfig
 from app.models.notification_email import NotificationEmail
 from app.models.notification_history import NotificationHistory
+from app.models.notification_history_alert import NotificationHistoryAlert
+from app.models.notification_outbox import NotificationOutbox, OutboxStatus
+from app.models.notification_pending import NotificationPending
 from app.models.managed_alert import ManagedAlert
 from app.models.user import User
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+class NotificationContext(NamedTuple):
+    """Datos necesarios para notificar, compartidos entre envíos (objetos desvinculados de la sesión)"""
+    config: Optional[NotificationConfig]
+    recipients: List[str]
+    sender_user: Optional[User]  # Usuario con el que se registran las notificaciones automáticas
 
 class EmailService:
     SMTP_HOST = "smtp.gmail.com"
     SMTP_PORT = 587
 
+    # Configuración, destinatarios y usuario se cargan una vez y se reutilizan
+    # hasta que los endpoints de notificaciones los invalidan (o vence el TTL)
+    _context_cache = TTLCache(ttl=settings.NOTIFICATION_CONTEXT_CACHE_TTL, maxsize=1)
+
+    @staticmethod
+    def get_context(db: Session) -> NotificationContext:
+        """Obtiene la configuración, los destinatarios activos y el usuario remitente cacheados"""
+        context = EmailService._context_cache.get("context")
+        if context is not None:
+            return context
+
+        config = EmailService.get_config(db)
+        recipients = [str(email.email) for email in EmailService.get_active_recipients(db)]
+        sender_user = db.query(User).order_by(User.id).first()
+        # Desvincular de la sesión para poder leerlos desde otras sesiones
+        for obj in (config, sender_user):
+            if obj is not None:
+                db.expunge(obj)
+
+        context = NotificationContext(config=config, recipients=recipients, sender_user=sender_user)
+        EmailService._context_cache.set("context", context)
+        return context
+
+    @staticmethod
+    def invalidate_context() -> None:
+        """Descarta el contexto cacheado (tras modificar configuración, destinatarios o usuarios)"""
+        EmailService._context_cache.invalidate()
+
     @staticmethod
     def get_config(db: Session) -> Optional[NotificationConfig]:
         """Obtiene la configuración de notificaciones. Retorna None si no existe."""
@@ -48,25 +88,26 @@ class EmailService:
         return list(db.scalars(stmt).all())
 
     @staticmethod
-    def send_alert_notification(
+    def enqueue_alert_notification(
         db: Session,
         alert: ManagedAlert,
         user: User,
         recipients: List[str],
         custom_message: Optional[str] = None
-    ) -> Tuple[bool, Optional[str]]:
+    ) -> Tuple[Optional[NotificationOutbox], Optional[str]]:
         """
-        Envía una notificación por correo sobre una alerta.
-        Retorna una tupla (success, error_message).
+        Encola una notificación por correo sobre una alerta. El envío lo realizan
+        los workers de la cola de notificaciones.
+        Retorna una tupla (job, error_message).
         """
-        config = EmailService.get_config(db)
+        config = EmailService.get_context(db).config
         is_valid, error_message = EmailService.validate_config(config)
         
         if not is_valid:
-            return False, error_message
+            return None, error_message
 
         if not recipients:
-            return False, "No se especificaron destinatarios para la notificación."
+            return None, "No se especificaron destinatarios para la notificación."
 
         # Crear el mensaje
         msg = MIMEMultipart()
@@ -102,34 +143,108 @@ class EmailService:
         setattr(history, 'message', custom_message)
         setattr(history, 'is_success', False)
         setattr(history, 'error_message', None)
+
+        return EmailService._enqueue(db, msg, history), None
+
+    @staticmethod
+    def build_digest_body(alerts: List[ManagedAlert]) -> str:
+        """Arma el cuerpo del correo resumen agrupando las alertas por agente y regla"""
+        groups: Dict[Tuple[str, str], Dict[Tuple[str, int, str], int]] = defaultdict(lambda: defaultdict(int))
+        for alert in alerts:
+            agent = (str(getattr(alert, 'agent_name')), str(getattr(alert, 'agent_id')))
+            rule = (str(getattr(alert, 'rule_id')), int(getattr(alert, 'rule_level')), str(getattr(alert, 'rule_description')))
+            groups[agent][rule] += 1
+
+        timestamps = [getattr(alert, 'timestamp') for alert in alerts]
+        lines = [
+            f"Se detectaron {len(alerts)} alertas de seguridad entre {min(timestamps)} y {max(timestamps)}:",
+            ""
+        ]
+        for (agent_name, agent_id), rules in sorted(groups.items(), key=lambda item: -sum(item[1].values())):
+            lines.append(f"Agente: {agent_name} ({agent_id}) - {sum(rules.values())} alertas")
+            for (rule_id, level, description), count in sorted(rules.items(), key=lambda item: (-item[0][1], -item[1])):
+                lines.append(f"  - [Nivel {level}] {description} (regla {rule_id}): {count} alertas")
+            lines.append("")
+        return "\n".join(lines)
+
+    @staticmethod
+    def enqueue_digest_notification(
+        db: Session,
+        alerts: List[ManagedAlert],
+        user: User,
+        recipients: List[str]
+    ) -> Tuple[Optional[NotificationOutbox], Optional[str]]:
+        """
+        Encola un único correo resumen con varias alertas, agrupadas por agente y regla.
+        El historial queda vinculado a cada alerta incluida.
+        Retorna una tupla (job, error_message).
+        """
+        config = EmailService.get_context(db).config
+        is_valid, error_message = EmailService.validate_config(config)
         
+        if not is_valid:
+            return None, error_message
+
+        if not recipients:
+            return None, "No se especificaron destinatarios para la notificación."
+
+        if not alerts:
+            return None, "No hay alertas para incluir en el resumen."
+
+        # Crear el mensaje
+        msg = MIMEMultipart()
+        sender_email = getattr(config, 'sender_email')
+        sender_name = getattr(config, 'sender_name')
+        max_level = max(int(getattr(alert, 'rule_level')) for alert in alerts)
+        msg["From"] = f"{sender_name} <{sender_email}>"
+        msg["To"] = ", ".join(recipients)
+        msg["Subject"] = f"Resumen de Alertas de Seguridad - {len(alerts)} alertas (nivel máximo {max_level})"
+        msg.attach(MIMEText(EmailService.build_digest_body(alerts), "plain"))
+
+        # Registrar el intento de notificación vinculado a todas las alertas
+        history = NotificationHistory()
+        setattr(history, 'alert_id', getattr(alerts[0], 'id'))
+        setattr(history, 'user_id', getattr(user, 'id'))
+        setattr(history, 'recipients', recipients)
+        setattr(history, 'subject', msg["Subject"])
+        setattr(history, 'message', None)
+        setattr(history, 'is_success', False)
+        setattr(history, 'error_message', None)
+
+        return EmailService._enqueue(db, msg, history, [getattr(alert, 'id') for alert in alerts]), None
+
+    @staticmethod
+    def _enqueue(
+        db: Session,
+        msg: MIMEMultipart,
+        history: NotificationHistory,
+        alert_ids: Optional[List[int]] = None
+    ) -> NotificationOutbox:
+        """
+        Registra el historial y el mensaje en la cola de envío en una única
+        transacción, quitando las alertas incluidas de las pendientes de
+        notificación. El resultado del envío lo completa el worker.
+        """
         db.add(history)
-        db.commit()
+        db.flush()
+        if alert_ids:
+            db.add_all([
+                NotificationHistoryAlert(history_id=history.id, alert_id=alert_id)
+                for alert_id in alert_ids
+            ])
 
-        try:
-            # Conectar al servidor SMTP
-            server = smtplib.SMTP(EmailService.SMTP_HOST, EmailService.SMTP_PORT)
-            server.starttls()
-            server.login(
-                str(sender_email),  # Usar sender_email como username
-                str(getattr(config, 'smtp_password'))
-            )
-            
-            # Enviar el correo
-            server.send_message(msg)
-            server.quit()
-            
-            # Registrar éxito
-            setattr(history, 'is_success', True)
-            db.commit()
-            return True, None
-
-        except Exception as e:
-            # Registrar error
-            error_message = f"Error al enviar el email: {str(e)}"
-            setattr(history, 'error_message', error_message)
-            db.commit()
-            return False, error_message
+        job = NotificationOutbox()
+        setattr(job, 'history_id', history.id)
+        setattr(job, 'message', msg.as_string())
+        setattr(job, 'status', OutboxStatus.PENDING)
+        setattr(job, 'attempts', 0)
+        setattr(job, 'next_attempt_at', datetime.utcnow())
+        db.add(job)
+        db.query(NotificationPending)\
+            .filter(NotificationPending.alert_id.in_(alert_ids or [history.alert_id]))\
+            .delete(synchronize_session=False)
+        db.commit()
+        return job
 
     @staticmethod
     def should_send_automatic_notification(db: Session, alert: ManagedAlert) -> Tuple[bool, Optional[str]]:
@@ -137,7 +252,7 @@ class EmailService:
         Determina si una alerta debe generar una notificación automática.
         Retorna una tupla (should_send, reason).
         """
-        config = EmailService.get_config(db)
+        config = EmailService.get_context(db).config
         is_valid, error_message = EmailService.validate_config(config)
         
         if not is_valid:
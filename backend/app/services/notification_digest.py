@@ -0,0 +1,99 @@
+from typing import Optional, Tuple
+from datetime import datetime
+import asyncio
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.managed_alert import ManagedAlert
+from app.models.notification_config import NotificationConfig
+from app.models.notification_pending import NotificationPending
+from app.services.email_service import EmailService
+from app.services.notification_outbox import notification_outbox
+
+class NotificationDigestService:
+    """
+    Envía las alertas pendientes de notificación como un único correo resumen.
+    El resumen sale cuando la alerta pendiente más antigua cumple la ventana
+    configurada, o antes si se juntan `digest_max_alerts`, pero nunca más de un
+    correo por ventana: el volumen de correos queda acotado sin importar la tasa
+    de alertas. Las alertas pendientes se guardan en Postgres, por lo que un
+    reinicio dentro de la ventana no las pierde.
+    """
+
+    def __init__(self):
+        self._last_sent_at: Optional[datetime] = None
+        self._lock = asyncio.Lock()
+
+    async def get_pending(self, db: AsyncSession) -> Tuple[int, Optional[datetime]]:
+        """Cantidad de alertas esperando el próximo resumen y cuándo llegó la más antigua"""
+        row = (await db.execute(
+            select(func.count(NotificationPending.id), func.min(NotificationPending.created_at))
+        )).one()
+        return row[0], row[1]
+
+    def is_due(self, config: NotificationConfig, pending_count: int, opened_at: Optional[datetime]) -> bool:
+        """Indica si corresponde enviar el resumen pendiente"""
+        if not pending_count or opened_at is None:
+            return False
+        now = datetime.utcnow()
+        window = int(getattr(config, 'digest_window_seconds'))
+        if self._last_sent_at is not None and (now - self._last_sent_at).total_seconds() < window:
+            return False
+        return (now - opened_at).total_seconds() >= window or pending_count >= int(getattr(config, 'digest_max_alerts'))
+
+    async def flush(
+        self,
+        db: AsyncSession,
+        config: Optional[NotificationConfig] = None
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Encola el resumen pendiente si el modo resumen está activo y corresponde,
+        con hasta `digest_max_alerts` alertas por correo. Las alertas dejan de
+        estar pendientes en la misma transacción que encola el correo; si no se
+        puede encolar, siguen pendientes para el próximo intento.
+        Retorna una tupla (queued, error_message).
+        """
+        async with self._lock:
+            context = await db.run_sync(EmailService.get_context)
+            if config is None:
+                config = context.config
+            if config is None or not getattr(config, 'digest_enabled'):
+                return False, None
+
+            pending_count, opened_at = await self.get_pending(db)
+            if not self.is_due(config, pending_count, opened_at):
+                return False, None
+
+            recipients = context.recipients
+            user = context.sender_user
+            if not recipients or not user:
+                return False, "No hay destinatarios o usuario para registrar el resumen."
+
+            # Como máximo digest_max_alerts por correo (las más antiguas); el resto
+            # sigue pendiente para el próximo resumen
+            oldest_pending = select(NotificationPending.alert_id)\
+                .order_by(NotificationPending.id)\
+                .limit(int(getattr(config, 'digest_max_alerts')))\
+                .scalar_subquery()
+            alerts = list((await db.scalars(
+                select(ManagedAlert)
+                .where(ManagedAlert.id.in_(oldest_pending))
+                .order_by(ManagedAlert.timestamp)
+            )).all())
+            if not alerts:
+                return False, None
+
+            job, error = await db.run_sync(
+                EmailService.enqueue_digest_notification,
+                alerts=alerts,
+                user=user,
+                recipients=recipients
+            )
+            if job is None:
+                return False, error
+            self._last_sent_at = datetime.utcnow()
+            notification_outbox.wake()
+            return True, None
+
+# Instancia global del servicio
+notification_digest = NotificationDigestService()
@@ -0,0 +1,202 @@
+from typing import List, Optional
+from datetime import datetime, timedelta
+from email import message_from_string
+import asyncio
+import random
+import aiosmtplib
+from fastapi import FastAPI
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.base import AsyncSessionLocal
+from app.models.notification_outbox import NotificationOutbox, OutboxStatus
+from app.services.email_service import EmailService
+from app.services.smtp_pool import smtp_pool
+import logging
+
+logger = logging.getLogger(__name__)
+
+class NotificationOutboxService:
+    """
+    Workers asíncronos que vacían la cola de notificaciones (outbox).
+    Cada worker toma un envío por vez, por lo que la concurrencia queda acotada
+    por la cantidad de workers. Los envíos fallidos se reintentan con espera
+    exponencial y, agotados los intentos, quedan descartados para revisión.
+    """
+
+    def __init__(self, workers: int, poll_interval: float):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping = False
+
+    def wake(self) -> None:
+        """
+        Avisa a los workers que hay envíos nuevos en la cola. Puede llamarse
+        desde los endpoints síncronos, que corren fuera del event loop.
+        """
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _claim(self, db: AsyncSession) -> Optional[NotificationOutbox]:
+        """
+        Toma el próximo envío vencido. Los envíos tomados por un worker que no
+        terminó (p. ej. por un reinicio) se retoman al vencer su plazo.
+        """
+        now = datetime.utcnow()
+        job = await db.scalar(
+            select(NotificationOutbox)
+            .options(selectinload(NotificationOutbox.history))
+            .where(
+                NotificationOutbox.status.in_([OutboxStatus.PENDING, OutboxStatus.SENDING]),
+                NotificationOutbox.next_attempt_at <= now
+            )
+            .order_by(NotificationOutbox.next_attempt_at, NotificationOutbox.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        if job is None:
+            await db.rollback()
+            return None
+
+        setattr(job, 'status', OutboxStatus.SENDING)
+        setattr(job, 'attempts', job.attempts + 1)
+        setattr(job, 'next_attempt_at', now + timedelta(seconds=settings.NOTIFICATION_SEND_LEASE_SECONDS))
+        await db.commit()
+        return job
+
+    @staticmethod
+    def _retry_delay(attempts: int) -> timedelta:
+        """Espera exponencial con un margen aleatorio para no reintentar todos a la vez"""
+        delay = min(
+            settings.NOTIFICATION_RETRY_BASE_SECONDS * 2 ** (attempts - 1),
+            settings.NOTIFICATION_RETRY_MAX_SECONDS
+        )
+        return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+    @staticmethod
+    def _is_permanent_error(error: Exception) -> bool:
+        """Rechazos definitivos del servidor (5xx) que no tiene sentido reintentar"""
+        if isinstance(error, aiosmtplib.SMTPRecipientsRefused):
+            return True
+        if isinstance(error, aiosmtplib.SMTPAuthenticationError):
+            # Puede corregirse actualizando la configuración: se reintenta
+            return False
+        return isinstance(error, aiosmtplib.SMTPResponseException) and 500 <= error.code < 600
+
+    async def _deliver(self, db: AsyncSession, job: NotificationOutbox) -> None:
+        """Envía un correo de la cola y registra el resultado en el job y en el historial"""
+        history = job.history
+        try:
+            # EmailService es síncrono: se ejecuta sobre la conexión asíncrona con run_sync
+            config = (await db.run_sync(EmailService.get_context)).config
+            is_valid, error_message = EmailService.validate_config(config)
+            if not is_valid:
+                raise RuntimeError(error_message)
+
+            # Enviar el correo reutilizando una conexión autenticada del pool
+            await smtp_pool.send(
+                message_from_string(str(job.message)),
+                host=str(getattr(config, 'smtp_host', None) or EmailService.SMTP_HOST),
+                port=int(getattr(config, 'smtp_port', None) or EmailService.SMTP_PORT),
+                username=str(getattr(config, 'sender_email')),  # Usar sender_email como username
+                password=str(getattr(config, 'smtp_password'))
+            )
+
+        except Exception as e:
+            # Registrar error y programar el reintento (o descartar)
+            error_message = f"Error al enviar el email: {str(e)}"
+            setattr(job, 'last_error', error_message)
+            setattr(history, 'error_message', error_message)
+            if self._is_permanent_error(e) or job.attempts >= settings.NOTIFICATION_MAX_ATTEMPTS:
+                setattr(job, 'status', OutboxStatus.DEAD)
+                # logger.error(f"❌ Notificación {job.id} descartada: {error_message}")
+            else:
+                setattr(job, 'status', OutboxStatus.PENDING)
+                setattr(job, 'next_attempt_at', datetime.utcnow() + self._retry_delay(job.attempts))
+            await db.commit()
+            return
+
+        # Registrar éxito
+        setattr(job, 'status', OutboxStatus.SENT)
+        setattr(job, 'sent_at', datetime.utcnow())
+        setattr(job, 'last_error', None)
+        setattr(history, 'is_success', True)
+        setattr(history, 'error_message', None)
+        await db.commit()
+
+    async def _wait(self) -> None:
+        """Espera un aviso de envíos nuevos o el intervalo de consulta"""
+        assert self._wakeup is not None
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def _worker(self) -> None:
+        """Toma y envía correos de la cola hasta que se detenga el servicio"""
+        while not self._stopping:
+            async with AsyncSessionLocal() as db:
+                try:
+                    job = await self._claim(db)
+                    if job is not None:
+                        await self._deliver(db, job)
+                        continue
+                except Exception as e:
+                    # logger.error(f"❌ Error procesando la cola de notificaciones: {str(e)}")
+                    await db.rollback()
+            await self._wait()
+
+    def retry(self, db: Session, job: NotificationOutbox) -> NotificationOutbox:
+        """Vuelve a encolar un envío descartado con los intentos reiniciados"""
+        setattr(job, 'status', OutboxStatus.PENDING)
+        setattr(job, 'attempts', 0)
+        setattr(job, 'next_attempt_at', datetime.utcnow())
+        db.commit()
+        db.refresh(job)
+        self.wake()
+        return job
+
+    def start(self, app: Optional[FastAPI] = None):
+        """Inicia los workers (al arrancar la aplicación si se indica)"""
+        if app:
+            @app.on_event("startup")
+            async def start_notification_workers():
+                self._start_workers()
+
+            @app.on_event("shutdown")
+            async def stop_notification_workers():
+                await self.stop()
+        else:
+            self._start_workers()
+
+    def _start_workers(self):
+        if self._tasks:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        # logger.info(f"✅ Cola de notificaciones iniciada con {self.workers} workers")
+
+    async def stop(self):
+        """
+        Detiene los workers. Un envío interrumpido queda tomado hasta que vence
+        su plazo y se retoma en el próximo arranque.
+        """
+        self._stopping = True
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+# Instancia global del servicio
+notification_outbox = NotificationOutboxService(
+    workers=settings.NOTIFICATION_WORKERS,
+    poll_interval=settings.NOTIFICATION_POLL_INTERVAL
+)
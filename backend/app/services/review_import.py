@@ -0,0 +1,115 @@
+from typing import Optional, Set
+from contextlib import aclosing
+from datetime import datetime
+import asyncio
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.base import AsyncSessionLocal
+from app.models.review_import_job import ReviewImportJob, ImportJobStatus
+from app.models.user import User
+from app.schemas.alert import AlertFilters
+from app.schemas.managed_alert import ManagedAlertCreate
+from app.services.alert_service import alert_service
+from app.services.review_service import review_service
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ReviewImportService:
+    """
+    Importa a la cola de revisión todas las alertas de OpenSearch que coinciden
+    con un filtro, en segundo plano. Las alertas se leen por lotes sobre un
+    point-in-time y se insertan en bloque omitiendo las ya gestionadas; el
+    progreso queda registrado en el job para consultarlo desde la API.
+    """
+
+    def __init__(self, batch_size: int, max_alerts: int):
+        self.batch_size = batch_size
+        self.max_alerts = max_alerts
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def start_import(self, db: AsyncSession, filters: AlertFilters, user: User) -> ReviewImportJob:
+        """Registra el job y lanza la importación en segundo plano"""
+        job = ReviewImportJob()
+        setattr(job, 'user_id', getattr(user, 'id'))
+        setattr(job, 'filters', filters.model_dump(mode="json", exclude_none=True))
+        setattr(job, 'status', ImportJobStatus.RUNNING)
+        setattr(job, 'processed', 0)
+        setattr(job, 'created', 0)
+        setattr(job, 'skipped', 0)
+        db.add(job)
+        await db.commit()
+
+        task = asyncio.create_task(self._run(job.id, filters))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def _run(self, job_id: int, filters: AlertFilters) -> None:
+        """Recorre las alertas del filtro e inserta cada lote en una transacción"""
+        async with AsyncSessionLocal() as db:
+            job = await db.get(ReviewImportJob, job_id)
+            if job is None:
+                return
+            try:
+                async with aclosing(alert_service.scan_alerts(filters, self.batch_size)) as batches:
+                    async for alerts, total, hits_read in batches:
+                        if job.total is None:
+                            if total > self.max_alerts:
+                                raise ValueError(
+                                    f"El filtro abarca {total} alertas; el máximo por importación es {self.max_alerts}"
+                                )
+                            setattr(job, 'total', total)
+
+                        created = await review_service.create_managed_alerts_bulk(
+                            db,
+                            [ManagedAlertCreate(alert_id=alert.id, alert_data=alert) for alert in alerts]
+                        )
+                        # create_managed_alerts_bulk confirma la transacción: el progreso va en la siguiente
+                        setattr(job, 'processed', job.processed + hits_read)
+                        setattr(job, 'created', job.created + len(created))
+                        setattr(job, 'skipped', job.skipped + hits_read - len(created))
+                        await db.commit()
+
+                setattr(job, 'total', job.total or 0)
+                setattr(job, 'status', ImportJobStatus.COMPLETED)
+                # logger.info(f"✅ Importación {job_id}: {job.created} alertas agregadas a la cola de revisión")
+            except asyncio.CancelledError:
+                await self._fail(db, job, "Importación interrumpida por el reinicio del servicio")
+                raise
+            except Exception as e:
+                # logger.error(f"❌ Error en la importación {job_id}: {str(e)}")
+                await self._fail(db, job, f"Error al importar las alertas: {str(e)}")
+                return
+
+            setattr(job, 'finished_at', datetime.utcnow())
+            await db.commit()
+
+    async def _fail(self, db: AsyncSession, job: ReviewImportJob, error_message: str) -> None:
+        """Marca el job como fallido conservando el progreso alcanzado"""
+        await db.rollback()
+        setattr(job, 'status', ImportJobStatus.FAILED)
+        setattr(job, 'error', error_message)
+        setattr(job, 'finished_at', datetime.utcnow())
+        await db.commit()
+
+    def start(self, app: FastAPI):
+        """Registra la detención de las importaciones en curso al apagar la aplicación"""
+        @app.on_event("shutdown")
+        async def stop_review_imports():
+            await self.stop()
+
+    async def stop(self):
+        """Cancela las importaciones en curso; quedan marcadas como fallidas"""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+# Instancia global del servicio
+review_import_service = ReviewImportService(
+    batch_size=settings.REVIEW_IMPORT_BATCH_SIZE,
+    max_alerts=settings.REVIEW_IMPORT_MAX_ALERTS
+)
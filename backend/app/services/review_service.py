@@ -1,13 +1,36 @@
-from typing import Optional, List, Sequence, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from datetime import datetime
-from app.models.managed_alert import ManagedAlert, AlertState
-from app.models.alert_note import AlertNote
-from app.schemas.managed_alert import ManagedAlertCreate, ManagedAlertUpdate, ManagedAlertResponse, ManagedAlertInDB
+from typing import Optional, List, Sequence, Any, Dict, Tuple
+import base64
+import json
+import math
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy import desc, select, update, delete, func, tuple_, or_, any_, literal, union_all, Integer, Select
+from sqlalchemy.dialects.postgresql import REGCONFIG, ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime, timezone
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.managed_alert import ManagedAlert, AlertState, SEARCH_CONFIG as ALERT_SEARCH_CONFIG
+from app.models.alert_note import AlertNote, SEARCH_CONFIG as NOTE_SEARCH_CONFIG
+from app.models.notification_pending import NotificationPending
+from app.models.notification_history import NotificationHistory
+from app.schemas.managed_alert import ManagedAlertCreate, ManagedAlertUpdate, ManagedAlertResponse, ManagedAlertInDB, ManagedAlertFilters
+from app.schemas.managed_alert import ManagedAlertSearchResult, ManagedAlertSearchResponse
 from app.schemas.alert_note import AlertNoteCreate, AlertNoteUpdate
 
 class ReviewService:
+    BULK_CHUNK_SIZE = 1000
+
+    def __init__(self):
+        # alert_id de OpenSearch ya gestionados que este proceso vio recientemente
+        self._seen_alert_ids = TTLCache(
+            ttl=settings.REVIEW_SEEN_CACHE_TTL,
+            maxsize=settings.REVIEW_SEEN_CACHE_SIZE
+        )
+        # Totales de la cola de revisión por combinación de filtros
+        self._count_cache = TTLCache(ttl=settings.REVIEW_COUNT_CACHE_TTL, maxsize=256)
+
     def _serialize_datetime(self, obj: Any) -> Any:
         """Convierte objetos datetime a strings ISO en un diccionario anidado"""
         if isinstance(obj, dict):
@@ -18,76 +41,331 @@ class ReviewService:
             return obj.isoformat()
         return obj
 
-    async def create_managed_alert(self, db: Session, alert: ManagedAlertCreate) -> Optional[ManagedAlert]:
-        """Crea una nueva alerta gestionada"""
-        # Verificar si la alerta ya existe
-        existing_alert = db.query(ManagedAlert).filter(
-            ManagedAlert.alert_id == alert.alert_id
-        ).first()
-        if existing_alert is not None:
-            return None
+    @staticmethod
+    def _naive_utc(value: datetime) -> datetime:
+        """
+        Convierte un datetime con zona horaria a UTC sin zona: las columnas son
+        TIMESTAMP WITHOUT TIME ZONE (en UTC) y asyncpg rechaza valores con zona
+        """
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
 
-        # Crear la alerta gestionada
-        alert_data = alert.alert_data.model_dump()
+    def _managed_alert_row(self, alert: ManagedAlertCreate, now: datetime) -> Dict[str, Any]:
+        """Arma los valores de la fila de una alerta gestionada"""
         # Serializar los datetime en alert_data
-        alert_data = self._serialize_datetime(alert_data)
-        
-        db_alert = ManagedAlert()
-        for key, value in {
+        alert_data = self._serialize_datetime(alert.alert_data.model_dump())
+        return {
             "alert_id": alert.alert_id,
             "state": AlertState.OPEN.value,
-            "timestamp": alert.alert_data.timestamp,
+            "timestamp": self._naive_utc(alert.alert_data.timestamp),
             "agent_id": alert.alert_data.agent.id,
             "agent_name": alert.alert_data.agent.name,
             "rule_id": alert.alert_data.rule.id,
             "rule_level": alert.alert_data.rule.level,
             "rule_description": alert.alert_data.rule.description,
-            "alert_data": alert_data
-        }.items():
-            setattr(db_alert, key, value)
+            "alert_data": alert_data,
+            "created_at": now,
+            "updated_at": now
+        }
 
-        db.add(db_alert)
-        db.commit()
-        db.refresh(db_alert)
-        return db_alert
+    async def create_managed_alerts_bulk(
+        self,
+        db: AsyncSession,
+        alerts: List[ManagedAlertCreate],
+        use_seen_cache: bool = True,
+        notify: bool = False
+    ) -> List[ManagedAlert]:
+        """
+        Crea en lote las alertas gestionadas que todavía no existen usando
+        INSERT ... ON CONFLICT (alert_id) DO NOTHING RETURNING, en una sola
+        transacción. Retorna solo las alertas efectivamente creadas.
+
+        Con `use_seen_cache` se descartan antes de consultar la base las alertas
+        vistas recientemente por este proceso. Con `notify` las alertas creadas
+        quedan pendientes de notificación en la misma transacción.
+        """
+        # Eliminar duplicados dentro del mismo lote y las alertas ya conocidas
+        pending: Dict[str, ManagedAlertCreate] = {}
+        for alert in alerts:
+            if use_seen_cache and self._seen_alert_ids.get(alert.alert_id):
+                continue
+            pending.setdefault(alert.alert_id, alert)
+
+        if not pending:
+            return []
+
+        now = datetime.utcnow()
+        rows = [self._managed_alert_row(alert, now) for alert in pending.values()]
+        created: List[ManagedAlert] = []
+        for start in range(0, len(rows), self.BULK_CHUNK_SIZE):
+            stmt = pg_insert(ManagedAlert)\
+                .values(rows[start:start + self.BULK_CHUNK_SIZE])\
+                .on_conflict_do_nothing(index_elements=[ManagedAlert.alert_id])\
+                .returning(ManagedAlert)
+            chunk = (await db.scalars(stmt)).all()
+            if notify and chunk:
+                await db.execute(pg_insert(NotificationPending).values([
+                    {"alert_id": alert.id, "created_at": now, "updated_at": now} for alert in chunk
+                ]))
+            created.extend(chunk)
+        # La sesión no expira los objetos al hacer commit: no hace falta recargarlos
+        await db.commit()
+        if created:
+            self._count_cache.invalidate()
+
+        # Tanto las creadas como las que ya existían quedan registradas como vistas
+        for alert_id in pending:
+            self._seen_alert_ids.set(alert_id, True)
+        return created
+
+    async def create_managed_alert(self, db: AsyncSession, alert: ManagedAlertCreate) -> Optional[ManagedAlert]:
+        """Crea una nueva alerta gestionada. Retorna None si ya existía."""
+        created = await self.create_managed_alerts_bulk(db, [alert], use_seen_cache=False)
+        return created[0] if created else None
+
+    def _encode_cursor(self, last: ManagedAlert, total: int, total_is_estimate: bool, page: int) -> str:
+        """Codifica la posición de la última alerta de la página en un cursor opaco"""
+        payload = json.dumps({
+            "created_at": getattr(last, 'created_at').isoformat(),
+            "id": getattr(last, 'id'),
+            "total": total,
+            "estimate": total_is_estimate,
+            "page": page
+        })
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+    def _decode_cursor(self, cursor: str) -> Dict[str, Any]:
+        """Decodifica un cursor generado por _encode_cursor"""
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            payload["created_at"] = datetime.fromisoformat(payload["created_at"])
+            payload["id"] = int(payload["id"])
+            return payload
+        except Exception:
+            raise ValueError("Cursor inválido")
+
+    def _apply_filters(self, query: Select, filters: ManagedAlertFilters) -> Select:
+        """Aplica los filtros de la cola de revisión"""
+        if filters.state and filters.state in [AlertState.OPEN.value, AlertState.CLOSED.value]:
+            query = query.where(ManagedAlert.state == filters.state)
+        if filters.rule_levels:
+            query = query.where(ManagedAlert.rule_level.in_(filters.rule_levels))
+        if filters.agent_ids:
+            query = query.where(ManagedAlert.agent_id.in_(filters.agent_ids))
+        if filters.from_date:
+            query = query.where(ManagedAlert.timestamp >= self._naive_utc(filters.from_date))
+        if filters.to_date:
+            query = query.where(ManagedAlert.timestamp <= self._naive_utc(filters.to_date))
+        # Filtros sobre el payload: se resuelven con @> para usar el índice GIN
+        if filters.data_contains:
+            query = query.where(ManagedAlert.alert_data.contains(filters.data_contains))
+        for path, value in filters.data_match or []:
+            # El valor puede ser un campo simple o un elemento de una lista (p. ej. rule.groups)
+            query = query.where(or_(*[
+                ManagedAlert.alert_data.contains(self._nest(path, document))
+                for candidate in self._match_values(value)
+                for document in (candidate, [candidate])
+            ]))
+        return query
+
+    @staticmethod
+    def _match_values(value: str) -> List[Any]:
+        """
+        Valores JSON con los que puede estar guardado el valor de un filtro
+        ruta:valor: siempre como texto y, si corresponde, como número, booleano
+        o null (rule.level:10 coincide con 10; data.srcport:22 con "22" o 22)
+        """
+        values: List[Any] = [value]
+        try:
+            parsed = json.loads(value)
+        except ValueError:
+            return values
+        # NaN e infinito (p. ej. 1e999) no son valores JSON válidos: solo como texto
+        if isinstance(parsed, float) and not math.isfinite(parsed):
+            return values
+        if parsed is None or isinstance(parsed, (bool, int, float)):
+            values.append(parsed)
+        return values
+
+    @staticmethod
+    def _nest(path: str, value: Any) -> Dict[str, Any]:
+        """Convierte una ruta con puntos y un valor en un documento anidado: a.b, v -> {"a": {"b": v}}"""
+        document: Any = value
+        for key in reversed(path.split(".")):
+            document = {key: document}
+        return document
+
+    async def _count(self, db: AsyncSession, query: Select, filters: ManagedAlertFilters, total_mode: str) -> Tuple[int, bool]:
+        """
+        Cuenta las alertas de la consulta según el modo pedido:
+        exact cuenta siempre, cached reutiliza el conteo exacto por unos segundos
+        y estimate cuenta hasta un tope. Retorna una tupla (total, is_estimate).
+        """
+        if total_mode == "estimate":
+            cap = settings.REVIEW_COUNT_ESTIMATE_CAP
+            limited = query.with_only_columns(ManagedAlert.id).limit(cap + 1).subquery()
+            total = await db.scalar(select(func.count()).select_from(limited)) or 0
+            return min(total, cap), total > cap
+
+        key = json.dumps(filters.model_dump(), sort_keys=True, default=str)
+        if total_mode == "cached":
+            cached = self._count_cache.get(key)
+            if cached is not None:
+                return cached, False
+
+        total = await db.scalar(select(func.count()).select_from(query.subquery())) or 0
+        self._count_cache.set(key, total)
+        return total, False
 
     async def get_managed_alerts(
         self,
-        db: Session,
+        db: AsyncSession,
         page: int = 1,
         size: int = 10,
-        state: Optional[str] = None
+        filters: Optional[ManagedAlertFilters] = None,
+        cursor: Optional[str] = None,
+        total_mode: str = "cached"
     ) -> ManagedAlertResponse:
-        """Obtiene la lista de alertas gestionadas con paginación"""
-        query = db.query(ManagedAlert)
-        
-        # Aplicar filtro por estado si se especifica
-        if state and state in [AlertState.OPEN.value, AlertState.CLOSED.value]:
-            query = query.filter(ManagedAlert.state == state)
-        
-        # Obtener total de registros
-        total = query.count()
-        
-        # Aplicar paginación
-        alerts: Sequence[ManagedAlert] = query.order_by(desc(ManagedAlert.created_at))\
-            .offset((page - 1) * size)\
-            .limit(size)\
-            .all()
+        """
+        Obtiene la lista de alertas gestionadas, de la más reciente a la más antigua.
+        Con `cursor` se pagina por (created_at, id) usando los índices compuestos,
+        sin OFFSET y sin volver a contar: el total viaja en el cursor.
+        """
+        filters = filters or ManagedAlertFilters()
+        query = self._apply_filters(select(ManagedAlert), filters)
+
+        if cursor:
+            position = self._decode_cursor(cursor)
+            total, total_is_estimate = int(position.get("total", 0)), bool(position.get("estimate", False))
+            page = int(position.get("page", 1)) + 1
+            query = query.where(
+                tuple_(ManagedAlert.created_at, ManagedAlert.id) < tuple_(position["created_at"], position["id"])
+            )
+        else:
+            total, total_is_estimate = await self._count(db, query, filters, total_mode)
+            if page > 1:
+                # Paginación por número de página (compatibilidad)
+                query = query.offset((page - 1) * size)
+
+        # Se pide una alerta de más para saber si hay página siguiente
+        rows: Sequence[ManagedAlert] = (await db.scalars(
+            query.order_by(desc(ManagedAlert.created_at), desc(ManagedAlert.id))
+            .limit(size + 1)
+        )).all()
+        alerts = list(rows[:size])
+        next_cursor = None
+        if len(rows) > size:
+            next_cursor = self._encode_cursor(alerts[-1], total, total_is_estimate, page)
         
         return ManagedAlertResponse(
             total=total,
             alerts=alerts,  # type: ignore
             page=page,
-            size=size
+            size=size,
+            total_is_estimate=total_is_estimate,
+            next_cursor=next_cursor
         )
 
-    async def get_managed_alert(self, db: Session, alert_id: int) -> Optional[ManagedAlert]:
+    def _encode_search_cursor(self, rank: float, alert_id: int) -> str:
+        """Codifica la posición del último resultado de la búsqueda en un cursor opaco"""
+        payload = json.dumps({"rank": rank, "id": alert_id})
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+    def _decode_search_cursor(self, cursor: str) -> Tuple[float, int]:
+        """Decodifica un cursor generado por _encode_search_cursor"""
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            return float(payload["rank"]), int(payload["id"])
+        except Exception:
+            raise ValueError("Cursor inválido")
+
+    def _text_hits(self, text: str) -> Any:
+        """
+        Alertas cuya descripción o alguna de cuyas notas coincide con la búsqueda,
+        con su relevancia. Una alerta que coincide en ambas suma las dos relevancias.
+        """
+        alert_query = func.websearch_to_tsquery(literal(ALERT_SEARCH_CONFIG, REGCONFIG), text)
+        note_query = func.websearch_to_tsquery(literal(NOTE_SEARCH_CONFIG, REGCONFIG), text)
+        description_hits = select(
+            ManagedAlert.id.label("alert_id"),
+            func.ts_rank(ManagedAlert.search_vector, alert_query).label("rank")
+        ).where(ManagedAlert.search_vector.bool_op("@@")(alert_query))
+        note_hits = select(
+            AlertNote.alert_id.label("alert_id"),
+            func.max(func.ts_rank(AlertNote.search_vector, note_query)).label("rank")
+        ).where(AlertNote.search_vector.bool_op("@@")(note_query)).group_by(AlertNote.alert_id)
+
+        hits = union_all(description_hits, note_hits).subquery("hits")
+        return select(hits.c.alert_id, func.sum(hits.c.rank).label("rank"))\
+            .group_by(hits.c.alert_id)\
+            .subquery("ranked")
+
+    async def search_managed_alerts(
+        self,
+        db: AsyncSession,
+        text: Optional[str] = None,
+        agent: Optional[str] = None,
+        state: Optional[str] = None,
+        size: int = 10,
+        cursor: Optional[str] = None
+    ) -> ManagedAlertSearchResponse:
+        """
+        Búsqueda de texto completo en las descripciones de las reglas y en las notas
+        de las alertas, ordenada por relevancia y paginada por (relevancia, id).
+        `agent` filtra por subcadena del nombre del agente (índice de trigramas);
+        sin texto, los resultados se ordenan por similitud con el nombre buscado.
+        """
+        if not text and not agent:
+            raise ValueError("Debe indicar un texto o un agente a buscar")
+
+        if text:
+            ranked = self._text_hits(text)
+            rank = ranked.c.rank
+            query = select(ManagedAlert, rank).join(ranked, ranked.c.alert_id == ManagedAlert.id)
+        else:
+            rank = func.similarity(ManagedAlert.agent_name, agent)
+            query = select(ManagedAlert, rank)
+
+        if agent:
+            query = query.where(ManagedAlert.agent_name.icontains(agent, autoescape=True))
+        query = self._apply_filters(query, ManagedAlertFilters(state=state))
+
+        if cursor:
+            last_rank, last_id = self._decode_search_cursor(cursor)
+            query = query.where(tuple_(rank, ManagedAlert.id) < tuple_(last_rank, last_id))
+
+        # Se pide un resultado de más para saber si hay página siguiente
+        rows = (await db.execute(
+            query.order_by(desc(rank), desc(ManagedAlert.id)).limit(size + 1)
+        )).all()
+        results = [
+            ManagedAlertSearchResult(**ManagedAlertInDB.model_validate(alert).model_dump(), rank=float(row_rank))
+            for alert, row_rank in rows[:size]
+        ]
+        next_cursor = None
+        if len(rows) > size:
+            last = results[-1]
+            next_cursor = self._encode_search_cursor(last.rank, last.id)
+
+        return ManagedAlertSearchResponse(results=results, size=size, next_cursor=next_cursor)
+
+    async def get_managed_alert(self, db: AsyncSession, alert_id: int) -> Optional[ManagedAlert]:
         """Obtiene una alerta gestionada por su ID"""
-        return db.query(ManagedAlert).filter(ManagedAlert.id == alert_id).first()
+        return await db.get(ManagedAlert, alert_id)
+
+    async def _get_alert_note(self, db: AsyncSession, alert_id: int, note_id: int) -> Optional[AlertNote]:
+        """Obtiene una nota de una alerta junto con su autor"""
+        return await db.scalar(
+            select(AlertNote)
+            .where(AlertNote.id == note_id, AlertNote.alert_id == alert_id)
+            .options(selectinload(AlertNote.author))
+            .execution_options(populate_existing=True)
+        )
 
     async def update_managed_alert(
         self,
-        db: Session,
+        db: AsyncSession,
         alert_id: int,
         alert_update: ManagedAlertUpdate
     ) -> Optional[ManagedAlert]:
@@ -98,13 +376,43 @@ class ReviewService:
 
         # Actualizar el estado
         setattr(db_alert, 'state', alert_update.state)
-        db.commit()
-        db.refresh(db_alert)
+        await db.commit()
+        self._count_cache.invalidate()
+        await db.refresh(db_alert)
         return db_alert
 
+    @staticmethod
+    def _id_in(column: Any, ids: List[int]) -> Any:
+        """column = ANY(:ids): un único parámetro de tipo arreglo en lugar de uno por ID"""
+        return column == any_(literal(ids, ARRAY(Integer)))
+
+    async def update_managed_alerts_state_bulk(
+        self,
+        db: AsyncSession,
+        ids: List[int],
+        state: str
+    ) -> List[int]:
+        """
+        Cambia el estado de varias alertas con un único UPDATE ... RETURNING.
+        Retorna los IDs de las alertas existentes (actualizadas).
+        """
+        if state not in [AlertState.OPEN.value, AlertState.CLOSED.value]:
+            raise ValueError("Estado no válido. Debe ser 'abierta' o 'cerrada'")
+
+        stmt = update(ManagedAlert)\
+            .where(self._id_in(ManagedAlert.id, ids))\
+            .values(state=state, updated_at=datetime.utcnow())\
+            .returning(ManagedAlert.id)\
+            .execution_options(synchronize_session=False)
+        updated = list((await db.scalars(stmt)).all())
+        await db.commit()
+        if updated:
+            self._count_cache.invalidate()
+        return updated
+
     async def create_alert_note(
         self,
-        db: Session,
+        db: AsyncSession,
         alert_id: int,
         note: AlertNoteCreate,
         author_id: int
@@ -125,24 +433,26 @@ class ReviewService:
             setattr(db_note, key, value)
 
         db.add(db_note)
-        db.commit()
-        db.refresh(db_note)
-        return db_note
+        await db.commit()
+        # Recargar la nota con su autor (no hay carga implícita de relaciones en modo asíncrono)
+        return await self._get_alert_note(db, alert_id, db_note.id)
 
     async def get_alert_notes(
         self,
-        db: Session,
+        db: AsyncSession,
         alert_id: int
     ) -> List[AlertNote]:
         """Obtiene todas las notas de una alerta gestionada"""
-        return db.query(AlertNote)\
-            .filter(AlertNote.alert_id == alert_id)\
-            .order_by(desc(AlertNote.created_at))\
-            .all()
+        return list((await db.scalars(
+            select(AlertNote)
+            .where(AlertNote.alert_id == alert_id)
+            .options(selectinload(AlertNote.author))
+            .order_by(desc(AlertNote.created_at))
+        )).all())
 
     async def update_alert_note(
         self,
-        db: Session,
+        db: AsyncSession,
         alert_id: int,
         note_id: int,
         note_update: AlertNoteUpdate,
@@ -150,9 +460,7 @@ class ReviewService:
     ) -> Optional[AlertNote]:
         """Actualiza una nota de una alerta gestionada"""
         # Verificar que la nota existe y pertenece a la alerta
-        db_note = db.query(AlertNote)\
-            .filter(AlertNote.id == note_id, AlertNote.alert_id == alert_id)\
-            .first()
+        db_note = await self._get_alert_note(db, alert_id, note_id)
         
         if db_note is None:
             return None
@@ -164,11 +472,10 @@ class ReviewService:
         # Actualizar el autor al último usuario que modificó la nota
         setattr(db_note, 'author_id', author_id)
 
-        db.commit()
-        db.refresh(db_note)
-        return db_note
+        await db.commit()
+        return await self._get_alert_note(db, alert_id, note_id)
 
-    async def delete_managed_alert(self, db: Session, alert_id: int) -> bool:
+    async def delete_managed_alert(self, db: AsyncSession, alert_id: int) -> bool:
         """Elimina una alerta gestionada y todas sus notas asociadas"""
         # Verificar que la alerta existe
         db_alert = await self.get_managed_alert(db, alert_id)
@@ -176,19 +483,64 @@ class ReviewService:
             return False
 
         # Eliminar todas las notas asociadas
-        db.query(AlertNote).filter(AlertNote.alert_id == alert_id).delete()
+        await db.execute(delete(AlertNote).where(AlertNote.alert_id == alert_id))
         
         # Eliminar la alerta
-        db.delete(db_alert)
-        db.commit()
+        self._seen_alert_ids.invalidate(getattr(db_alert, 'alert_id'))
+        await db.delete(db_alert)
+        await db.commit()
+        self._count_cache.invalidate()
         return True
 
-    async def delete_alert_note(self, db: Session, alert_id: int, note_id: int, author_id: int) -> bool:
+    async def _notified_alert_ids(self, db: AsyncSession, ids: List[int]) -> List[int]:
+        """IDs de las alertas que tienen notificaciones registradas en el historial"""
+        return list((await db.scalars(
+            select(NotificationHistory.alert_id)
+            .where(self._id_in(NotificationHistory.alert_id, ids))
+            .distinct()
+            .order_by(NotificationHistory.alert_id)
+        )).all())
+
+    async def delete_managed_alerts_bulk(self, db: AsyncSession, ids: List[int]) -> Tuple[List[int], List[int]]:
+        """
+        Elimina varias alertas gestionadas y sus notas en una sola transacción.
+        Las alertas con notificaciones en el historial no se pueden eliminar sin
+        perder ese registro: si hay alguna, no se elimina ninguna.
+        Retorna una tupla (IDs eliminados, IDs bloqueados por el historial).
+        """
+        notified = await self._notified_alert_ids(db, ids)
+        if notified:
+            await db.rollback()
+            return [], notified
+
+        try:
+            await db.execute(
+                delete(AlertNote)
+                .where(self._id_in(AlertNote.alert_id, ids))
+                .execution_options(synchronize_session=False)
+            )
+            deleted = (await db.execute(
+                delete(ManagedAlert)
+                .where(self._id_in(ManagedAlert.id, ids))
+                .returning(ManagedAlert.id, ManagedAlert.alert_id)
+                .execution_options(synchronize_session=False)
+            )).all()
+            await db.commit()
+        except IntegrityError:
+            # Se registró una notificación entre la verificación y el borrado
+            await db.rollback()
+            return [], await self._notified_alert_ids(db, ids)
+
+        for _, alert_id in deleted:
+            self._seen_alert_ids.invalidate(alert_id)
+        if deleted:
+            self._count_cache.invalidate()
+        return [id_ for id_, _ in deleted], []
+
+    async def delete_alert_note(self, db: AsyncSession, alert_id: int, note_id: int, author_id: int) -> bool:
         """Elimina una nota de una alerta gestionada"""
         # Verificar que la nota existe y pertenece a la alerta
-        db_note = db.query(AlertNote)\
-            .filter(AlertNote.id == note_id, AlertNote.alert_id == alert_id)\
-            .first()
+        db_note = await self._get_alert_note(db, alert_id, note_id)
         
         if db_note is None:
             return False
@@ -197,8 +549,8 @@ class ReviewService:
         if not author_matches:
             return False
 
-        db.delete(db_note)
-        db.commit()
+        await db.delete(db_note)
+        await db.commit()
         return True
 
 # Instancia global del servicio
@@ -0,0 +1,83 @@
+from collections import Counter
+from datetime import date
+from typing import Dict, List, Set, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from app.models.alert_daily_rollup import AlertDailyRollup, RollupDimension
+
+# Conteos agregados por dimensión: {"level": Counter, "rule": Counter, "agent": Counter}
+DimensionCounts = Dict[str, Counter]
+
+class AlertRollupService:
+    """Persistencia de los conteos diarios de alertas de días cerrados"""
+
+    def get_rolled_up_days(self, db: Session, start_day: date, end_day: date) -> Set[date]:
+        """Obtiene los días del rango (inclusive) que ya tienen conteos guardados"""
+        rows = db.query(AlertDailyRollup.day).filter(
+            AlertDailyRollup.dimension == RollupDimension.TOTAL.value,
+            AlertDailyRollup.day >= start_day,
+            AlertDailyRollup.day <= end_day
+        ).all()
+        return {row.day for row in rows}
+
+    def get_counts(
+        self,
+        db: Session,
+        start_day: date,
+        end_day: date
+    ) -> Tuple[DimensionCounts, Dict[date, int]]:
+        """
+        Suma los conteos guardados en el rango (inclusive).
+        Retorna los conteos por dimensión y el total de cada día.
+        """
+        rows = db.query(
+            AlertDailyRollup.day,
+            AlertDailyRollup.dimension,
+            AlertDailyRollup.key,
+            AlertDailyRollup.count
+        ).filter(
+            AlertDailyRollup.day >= start_day,
+            AlertDailyRollup.day <= end_day
+        ).all()
+
+        counts: DimensionCounts = {
+            RollupDimension.LEVEL.value: Counter(),
+            RollupDimension.RULE.value: Counter(),
+            RollupDimension.AGENT.value: Counter()
+        }
+        per_day: Dict[date, int] = {}
+        for row in rows:
+            if row.dimension == RollupDimension.TOTAL.value:
+                per_day[row.day] = row.count
+            elif row.dimension in counts:
+                counts[row.dimension][row.key] += row.count
+        return counts, per_day
+
+    def purge_before(self, db: Session, day: date) -> None:
+        """Elimina los conteos anteriores al día indicado (fuera de la retención)"""
+        db.query(AlertDailyRollup).filter(AlertDailyRollup.day < day).delete()
+        db.commit()
+
+    def save_day(self, db: Session, day: date, counts: DimensionCounts, total: int) -> bool:
+        """
+        Guarda (reemplazando si existieran) los conteos de un día cerrado.
+        Retorna False si otro proceso guardó el mismo día en paralelo.
+        """
+        rows: List[AlertDailyRollup] = [
+            AlertDailyRollup(day=day, dimension=RollupDimension.TOTAL.value, key="", count=total)
+        ]
+        for dimension, counter in counts.items():
+            for key, count in counter.items():
+                rows.append(AlertDailyRollup(day=day, dimension=dimension, key=str(key), count=count))
+
+        try:
+            db.query(AlertDailyRollup).filter(AlertDailyRollup.day == day).delete()
+            db.add_all(rows)
+            db.commit()
+            return True
+        except IntegrityError:
+            db.rollback()
+            return False
+
+# Instancia global del servicio
+alert_rollup_service = AlertRollupService()
@@ -0,0 +1,102 @@
+from typing import List, Optional, Tuple
+from email.message import Message
+import asyncio
+import time
+import aiosmtplib
+
+from app.core.config import settings
+
+# Errores tras los cuales la conexión se descarta y se reintenta con una nueva
+RECONNECT_ERRORS = (
+    aiosmtplib.SMTPServerDisconnected,
+    aiosmtplib.SMTPConnectError,
+    aiosmtplib.SMTPTimeoutError,
+    ConnectionError,
+    OSError
+)
+
+# Datos de conexión que identifican a las conexiones reutilizables
+ConnectionKey = Tuple[str, int, str, str]
+
+class SMTPConnectionPool:
+    """
+    Pool de conexiones SMTP asíncronas (aiosmtplib) ya autenticadas.
+    Las conexiones se reutilizan entre envíos, se descartan al quedar ociosas
+    más de `idle_timeout` segundos y se reconectan si el servidor las cierra.
+    """
+
+    def __init__(self, max_size: int, idle_timeout: float):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._semaphore = asyncio.Semaphore(max_size)
+        # Conexiones libres: (conexión, datos de conexión, último uso)
+        self._idle: List[Tuple[aiosmtplib.SMTP, ConnectionKey, float]] = []
+
+    async def _connect(self, key: ConnectionKey) -> aiosmtplib.SMTP:
+        """Abre una conexión nueva (STARTTLS si el servidor lo soporta) e inicia sesión"""
+        host, port, username, password = key
+        smtp = aiosmtplib.SMTP(
+            hostname=host,
+            port=port,
+            username=username,
+            password=password,
+            timeout=settings.SMTP_TIMEOUT
+        )
+        await smtp.connect()
+        return smtp
+
+    async def _discard(self, smtp: aiosmtplib.SMTP) -> None:
+        """Cierra una conexión sin propagar errores"""
+        try:
+            if smtp.is_connected:
+                await smtp.quit()
+        except Exception:
+            smtp.close()
+
+    async def _acquire(self, key: ConnectionKey) -> aiosmtplib.SMTP:
+        """Toma una conexión libre y vigente o abre una nueva"""
+        while self._idle:
+            smtp, smtp_key, last_used = self._idle.pop()
+            if smtp_key == key and smtp.is_connected and time.monotonic() - last_used < self.idle_timeout:
+                return smtp
+            await self._discard(smtp)
+        return await self._connect(key)
+
+    def _release(self, smtp: aiosmtplib.SMTP, key: ConnectionKey) -> None:
+        """Devuelve una conexión al pool para reutilizarla"""
+        self._idle.append((smtp, key, time.monotonic()))
+
+    async def send(self, message: Message, host: str, port: int, username: str, password: str) -> None:
+        """
+        Envía un mensaje usando una conexión del pool.
+        Si la conexión reutilizada estaba cerrada, reintenta una vez con una nueva.
+        """
+        key: ConnectionKey = (host, port, username, password)
+        async with self._semaphore:
+            for attempt in range(2):
+                smtp = await self._acquire(key)
+                try:
+                    await smtp.send_message(message)
+                except RECONNECT_ERRORS:
+                    await self._discard(smtp)
+                    if attempt == 1:
+                        raise
+                    continue
+                except Exception:
+                    # Ante errores de protocolo no se reutiliza la conexión
+                    await self._discard(smtp)
+                    raise
+                self._release(smtp, key)
+                return
+
+    async def close(self) -> None:
+        """Cierra todas las conexiones libres"""
+        idle, self._idle = self._idle, []
+        for smtp, _, _ in idle:
+            await self._discard(smtp)
+
+# Instancia global del pool
+smtp_pool = SMTPConnectionPool(
+    max_size=settings.SMTP_POOL_SIZE,
+    idle_timeout=settings.SMTP_POOL_IDLE_TIMEOUT
+)
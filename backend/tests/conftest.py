@@ -0,0 +1,19 @@
+import os
+
+# Valores mínimos para poder importar la configuración sin un archivo .env
+for name, value in {
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_USER": "postgres",
+    "POSTGRES_PASSWORD": "postgres",
+    "POSTGRES_DB": "wazuh_monitor_test",
+    "SECRET_KEY": "test",
+    "INITIAL_ADMIN_EMAIL": "admin@example.com",
+    "INITIAL_ADMIN_USERNAME": "admin",
+    "INITIAL_ADMIN_PASSWORD": "admin",
+    "OPENSEARCH_HOST": "localhost",
+    "OPENSEARCH_PORT": "9200",
+    "OPENSEARCH_INDEX": "wazuh-alerts-*",
+    "OPENSEARCH_USER": "admin",
+    "OPENSEARCH_PASSWORD": "admin",
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,30 @@
+"""
+Los filtros ruta:valor de la cola de revisión se comparan contra alert_data
+(jsonb) como texto y, si corresponde, como número, booleano o null. Todos los
+valores deben poder serializarse como JSON válido para el operador @>.
+"""
+import json
+
+import pytest
+
+from app.services.review_service import ReviewService
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("10", ["10", 10]),
+    ("1.5", ["1.5", 1.5]),
+    ("true", ["true", True]),
+    ("null", ["null", None]),
+    ("abc", ["abc"]),
+    ('"22"', ['"22"']),
+])
+def test_match_values(value, expected):
+    assert ReviewService._match_values(value) == expected
+
+
+@pytest.mark.parametrize("value", ["1e999", "-1e999", "NaN", "Infinity", "-Infinity"])
+def test_non_finite_numbers_only_match_as_text(value):
+    values = ReviewService._match_values(value)
+    assert values == [value]
+    for candidate in values:
+        json.dumps(ReviewService._nest("data.value", candidate), allow_nan=False)